@@ -0,0 +1,38 @@
+# -*- coding: utf-8 -*-
+"""Compare the blits of the raw widget images with the images converted for the display
+
+Run it from the root of the repository with : python bench/blit_bench.py"""
+
+import os
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+from timeit import timeit
+
+import pygame
+from wipyg.buttons import PlainButton
+from wipyg.entry import Entry
+from wipyg.label import Label
+
+pygame.init()
+screen = pygame.display.set_mode((800, 600))
+
+widgets = {
+    "PlainButton (opaque)": PlainButton("Hello world"),
+    "Label (opaque)": Label("Hello world", bg_color=(255, 255, 255)),
+    "Label (transparent)": Label("Hello world"),
+    "Entry (transparent)": Entry("Hello world", length=20),
+}
+
+print(f"{'widget':>22} {'image (us)':>11} {'display_image (us)':>19} {'speedup':>8}")
+number = 5000
+for name, w in widgets.items():
+    image = w.image
+    # the first uses convert the image, they aren't measured
+    w.display_image
+    display_image = w.display_image
+    old = timeit(lambda: screen.blit(image, (10, 10)), number=number) / number
+    new = timeit(lambda: screen.blit(display_image, (10, 10)), number=number) / number
+    print(f"{name:>22} {old * 1e6:>11.2f} {new * 1e6:>19.2f} {old / new:>8.2f}")
+
+pygame.quit()
@@ -0,0 +1,42 @@
+# -*- coding: utf-8 -*-
+"""Measure a panel of 64 sparklines of 10k samples, built then updated at each frame
+
+Run it from the root of the repository with : python bench/chart_bench.py"""
+
+import os
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+from math import sin
+from timeit import timeit
+
+import pygame
+from wipyg.chart import Chart, numpy
+
+pygame.init()
+screen = pygame.display.set_mode((800, 640))
+
+if numpy is not None:
+    samples = numpy.sin(numpy.arange(10000) / 50)
+else:
+    samples = [sin(i / 50) for i in range(10000)]
+charts = []
+
+
+def build():
+    charts[:] = [Chart(samples, size=(200, 40), capacity=10000) for _ in range(64)]
+
+
+def frame():
+    # 60 new samples per sparkline, as from a 3.6 kHz sensor at 60 FPS
+    new = samples[:60]
+    for i, chart in enumerate(charts):
+        chart.append(new)
+        chart.draw(screen, (200 * (i % 4), 40 * (i // 4)))
+
+
+print("NumPy" if numpy is not None else "no NumPy")
+print(f"build the panel : {timeit(build, number=5) / 5 * 1000:8.2f} ms")
+print(f"one frame       : {timeit(frame, number=100) / 100 * 1000:8.2f} ms")
+
+pygame.quit()
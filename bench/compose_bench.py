@@ -0,0 +1,54 @@
+# -*- coding: utf-8 -*-
+"""Compare the batched composition of a Frame with a blit per child
+
+Run it from the root of the repository with : python bench/compose_bench.py"""
+
+import os
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+from timeit import timeit
+
+import pygame
+from pygame import Surface
+from wipyg.abstracts import Widget
+from wipyg.containers import Frame
+
+
+class Cell(Widget):
+    """A cheap widget : a small coloured square"""
+
+    def __init__(self, color):
+        super().__init__()
+        self.image = Surface((8, 8))
+        self.image.fill(color)
+        self.rect = self.image.get_rect()
+
+    def redraw(self):
+        pass
+
+
+def per_child(frame: Frame, target: Surface):
+    """The composition as it was done before, one blit per child"""
+    for w in frame._drawn_children():
+        target.blit(w.display_image, w.rect)
+
+
+pygame.init()
+# large enough for the whole grid to be visible
+pygame.display.set_mode((1000, 1000))
+
+print(f"{'cells':>6} {'per child (ms)':>15} {'batched (ms)':>13} {'speedup':>8}")
+for side in (10, 32, 100):
+    grid = [[Cell((x % 256, y % 256, 0)) for x in range(side)] for y in range(side)]
+    frame = Frame(grid)
+    target = Surface(frame.rect.size, pygame.SRCALPHA)
+    number = max(5, 100000 // (side * side))
+    # warm up both paths, the first calls are much slower
+    per_child(frame, target)
+    frame._compose(target)
+    old = timeit(lambda: per_child(frame, target), number=number) / number
+    new = timeit(lambda: frame._compose(target), number=number) / number
+    print(f"{side * side:>6} {old * 1000:>15.3f} {new * 1000:>13.3f} {old / new:>8.2f}")
+
+pygame.quit()
@@ -0,0 +1,42 @@
+# -*- coding: utf-8 -*-
+"""Measure the time needed to import wipyg, each import in a fresh interpreter
+
+Run it from the root of the repository with : python bench/import_bench.py"""
+
+import os
+import subprocess
+import sys
+from statistics import median
+
+STATEMENTS = {
+    "import wipyg": "import wipyg",
+    "import wipyg.abstracts": "import wipyg.abstracts",
+    "from wipyg import Frame": "from wipyg import Frame",
+    "from wipyg import *": "from wipyg import *",
+    "import pygame (reference)": "import pygame",
+}
+
+SCRIPT = """
+from time import perf_counter
+start = perf_counter()
+{}
+print(perf_counter() - start)
+"""
+
+env = dict(os.environ, PYGAME_HIDE_SUPPORT_PROMPT="1", SDL_VIDEODRIVER="dummy")
+src = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src")
+env["PYTHONPATH"] = os.pathsep.join(filter(None, [src, env.get("PYTHONPATH")]))
+
+print(f"{'statement':>26} {'median (ms)':>12}")
+for name, statement in STATEMENTS.items():
+    times = []
+    for _ in range(15):
+        out = subprocess.run(
+            [sys.executable, "-c", SCRIPT.format(statement)],
+            env=env,
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+        times.append(float(out.stdout.split()[-1]))
+    print(f"{name:>26} {median(times) * 1000:>12.1f}")
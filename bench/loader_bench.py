@@ -0,0 +1,52 @@
+# -*- coding: utf-8 -*-
+"""Compare parsing a JSON description at each build of a screen with reusing its compiled LayoutPlan
+
+Run it from the root of the repository with : python bench/loader_bench.py"""
+
+import os
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+import json
+import tempfile
+from time import perf_counter
+
+import pygame
+from wipyg.loader import compile_layout, load_layout
+
+pygame.init()
+screen = pygame.display.set_mode((800, 600))
+
+rows = [
+    [{"type": "Label", "text": f"Value {i}-{j}", "size": 18} for j in range(8)]
+    + [{"type": "PlainButton", "text": f"Go {i}", "size": 18, "on": {"clicked": "go"}}]
+    for i in range(60)
+]
+description = {"type": "Frame", "bg_color": [250, 250, 250], "grid": rows}
+path = os.path.join(tempfile.mkdtemp(), "screen.json")
+with open(path, "w") as f:
+    json.dump(description, f)
+handlers = {"go": lambda w, e: True}
+
+
+def timed(build, number=20):
+    start = perf_counter()
+    for _ in range(number):
+        build()
+    return (perf_counter() - start) / number * 1e3
+
+
+def parsed_each_time():
+    with open(path) as f:
+        compile_layout(json.load(f)).build(handlers)
+
+
+# the fonts are loaded once for all the runs
+load_layout(path).build(handlers)
+print(f"parsed and compiled at each build : {timed(parsed_each_time):6.1f} ms")
+print(
+    f"cached plan                       : {timed(lambda: load_layout(path).build(handlers)):6.1f} ms"
+)
+os.remove(path)
+
+pygame.quit()
@@ -0,0 +1,68 @@
+# -*- coding: utf-8 -*-
+"""Compare building a small dialog Window at each opening with recycling it from a WidgetPool
+
+Run it from the root of the repository with : python bench/pool_bench.py"""
+
+import os
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+from itertools import count
+from timeit import timeit
+
+import pygame
+from wipyg.buttons import CancelButton, SubmitButton
+from wipyg.containers import Frame, Window
+from wipyg.entry import Entry
+from wipyg.label import Label
+from wipyg.pool import WidgetPool
+
+pygame.init()
+screen = pygame.display.set_mode((800, 600))
+
+
+def make_dialog(question: str, value: str = "") -> Window:
+    label = Label(question)
+    entry = Entry(value, length=20)
+    buttons = Frame([[SubmitButton("Yes"), CancelButton("No")]])
+    dialog = Window(Frame([[label], [entry], [buttons]]))
+    # what the setup changes
+    dialog.question, dialog.entry = label, entry
+    return dialog
+
+
+def setup_dialog(dialog: Window, question: str, value: str = ""):
+    dialog.question.text = question
+    dialog.entry.value = value
+
+
+pool = WidgetPool()
+pool.register("ask", make_dialog, setup_dialog)
+
+
+# each opening asks another question, so the setup of a recycled dialog redraws it
+questions = [(f"Delete the file {i} ?", f"file{i}.txt") for i in range(100)]
+
+
+def open_close(dialog: Window):
+    """Show the dialog for one frame, then close it"""
+    dialog.update()
+    dialog.kill()
+
+
+def open_close_built():
+    open_close(make_dialog(*questions[next(turns) % len(questions)]))
+
+
+def open_close_pooled():
+    open_close(pool.acquire("ask", *questions[next(turns) % len(questions)]))
+
+
+number = 500
+turns = count()
+built = timeit(open_close_built, number=number) / number
+pooled = timeit(open_close_pooled, number=number) / number
+print(f"built  : {built * 1e3:6.3f} ms per dialog")
+print(f"pooled : {pooled * 1e3:6.3f} ms per dialog ({pool.hit_rate:.1%} recycled)")
+
+pygame.quit()
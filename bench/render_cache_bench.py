@@ -0,0 +1,52 @@
+# -*- coding: utf-8 -*-
+"""Compare the time to build and show a big screen without render cache, with a cold one and with a warm one
+
+Run it from the root of the repository with : python bench/render_cache_bench.py"""
+
+import os
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+import tempfile
+from time import perf_counter
+
+import pygame
+from wipyg.buttons import PlainButton
+from wipyg.containers import Frame
+from wipyg.diskcache import RenderCache
+from wipyg.label import Label
+
+pygame.init()
+screen = pygame.display.set_mode((800, 600))
+
+
+def build():
+    rows = [
+        [Label(f"Value {i}-{j}", size=18) for j in range(8)]
+        + [PlainButton(f"Go {i}", size=18)]
+        for i in range(60)
+    ]
+    return Frame(rows, bg_color=(250, 250, 250))
+
+
+def timed():
+    """Build the screen and draw its first frame"""
+    start = perf_counter()
+    frame = build()
+    frame.update()
+    frame.draw(screen)
+    return (perf_counter() - start) * 1e3
+
+
+# the fonts are loaded once for all the runs
+build()
+path = os.path.join(tempfile.mkdtemp(), "render.cache")
+print(f"no cache   : {timed():7.1f} ms")
+with RenderCache(path):
+    print(f"cold cache : {timed():7.1f} ms")
+with RenderCache(path) as cache:
+    print(f"warm cache : {timed():7.1f} ms ({cache.hits} hits)")
+print(f"cache file : {os.path.getsize(path) / 2**20:7.1f} MiB")
+os.remove(path)
+
+pygame.quit()
@@ -0,0 +1,59 @@
+# -*- coding: utf-8 -*-
+"""Show an example of a WindowManager stacking several overlapping Windows
+
+Click on a Window to raise it above the others, only the topmost Window under
+the pointer reacts to the mouse."""
+
+import pygame
+from pygame.constants import *
+from wipyg import buttons, label, containers
+from wipyg.abstracts import Button
+
+# CALLBACK
+def quit(s, e):
+    global looping
+    if e.button == s:
+        looping = False
+
+
+# INITIALIZATION
+
+pygame.init()
+
+screen = pygame.display.set_mode((640, 480))
+screen_rect = screen.get_rect()
+pygame.display.set_caption("Demo of wipyg WindowManager")
+
+manager = containers.WindowManager(screen_rect.size)
+
+for i in range(5):
+    but_quit = buttons.CancelButton(text="Quitter")
+    but_quit.add_reaction(Button.CLICKED, quit)
+    frame = containers.Frame(
+        widgets=[[label.Label(f"Window {i + 1}")], [but_quit]],
+        bg_color=(110, 110, 110),
+    )
+    window = containers.Window(frame, bar_color=(255, 40 * i, 0))
+    window.rect.topleft = (60 + 60 * i, 40 + 50 * i)
+    manager.add_widget(window)
+
+widgets = pygame.sprite.RenderPlain(manager)
+
+looping = True
+
+# MAIN LOOP
+
+while looping:
+    for e in pygame.event.get():
+        for w in widgets:
+            w.react(e)
+        if e.type == QUIT:
+            looping = False
+
+    widgets.update()
+    screen.fill((50, 50, 200))
+    widgets.draw(screen)
+
+    pygame.display.flip()
+
+pygame.quit()
@@ -1,11 +1,68 @@
 # -*- coding: utf-8 -*-
-"""wipyg provides some widgets class based on Sprite to build basic GUIs in Pygame."""
+"""wipyg provides some widgets class based on Sprite to build basic GUIs in Pygame.
 
-from wipyg.abstracts import *
-from wipyg.containers import *
-from wipyg.buttons import *
-from wipyg.entry import *
-from wipyg.label import *
+The submodules (and pygame itself) are only imported when one of their names is
+used for the first time, so importing wipyg just for type references is cheap.
+"""
+
+from importlib import import_module
+
+# the type checkers recognize this name, importing typing would double the import time
+TYPE_CHECKING = False
+
+_MODULES = (
+    "abstracts",
+    "containers",
+    "buttons",
+    "entry",
+    "label",
+    "record",
+    "loop",
+    "memory",
+    "binding",
+    "table",
+    "chart",
+    "resources",
+    "skin",
+    "diskcache",
+    "pool",
+    "loader",
+)
+
+# the submodule defining each name
+_NAMES = {
+    "Widget": "abstracts",
+    "Container": "abstracts",
+    "GridContainer": "abstracts",
+    "Button": "abstracts",
+    "Frame": "containers",
+    "Window": "containers",
+    "WindowManager": "containers",
+    "CROSS": "containers",
+    "BAR": "containers",
+    "PlainButton": "buttons",
+    "SubmitButton": "buttons",
+    "CancelButton": "buttons",
+    "IconButton": "buttons",
+    "Entry": "entry",
+    "Label": "label",
+    "Recorder": "record",
+    "Replayer": "record",
+    "MainLoop": "loop",
+    "MemoryBudget": "memory",
+    "memory_report": "memory",
+    "Observable": "binding",
+    "Table": "table",
+    "Chart": "chart",
+    "get_scale": "resources",
+    "set_scale": "resources",
+    "Skin": "skin",
+    "RenderCache": "diskcache",
+    "WidgetPool": "pool",
+    "LayoutPlan": "loader",
+    "compile_layout": "loader",
+    "load_layout": "loader",
+}
 
 __all__ = [
     "abstracts",
@@ -13,12 +70,74 @@ __all__ = [
     "buttons",
     "entry",
     "label",
+    "record",
+    "loop",
+    "memory",
+    "binding",
+    "table",
+    "chart",
+    "resources",
+    "skin",
+    "diskcache",
+    "pool",
+    "loader",
     "Frame",
     "Window",
+    "WindowManager",
     "PlainButton",
     "SubmitButton",
     "CancelButton",
     "IconButton",
     "Entry",
     "Label",
+    "Recorder",
+    "Replayer",
+    "MainLoop",
+    "MemoryBudget",
+    "memory_report",
+    "Observable",
+    "Table",
+    "Chart",
+    "get_scale",
+    "set_scale",
+    "Skin",
+    "RenderCache",
+    "WidgetPool",
+    "LayoutPlan",
+    "compile_layout",
+    "load_layout",
 ]
+
+
+def __getattr__(name: str):
+    if name in _MODULES:
+        return import_module(f"wipyg.{name}")
+    if name not in _NAMES:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(f"wipyg.{_NAMES[name]}"), name)
+    # the next accesses don't go through __getattr__
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_NAMES) | set(_MODULES))
+
+
+if TYPE_CHECKING:
+    from wipyg.abstracts import Widget, Container, GridContainer, Button
+    from wipyg.containers import Frame, Window, WindowManager
+    from wipyg.buttons import PlainButton, SubmitButton, CancelButton, IconButton
+    from wipyg.entry import Entry
+    from wipyg.label import Label
+    from wipyg.record import Recorder, Replayer
+    from wipyg.loop import MainLoop
+    from wipyg.memory import MemoryBudget, memory_report
+    from wipyg.binding import Observable
+    from wipyg.table import Table
+    from wipyg.chart import Chart
+    from wipyg.resources import get_scale, set_scale
+    from wipyg.skin import Skin
+    from wipyg.diskcache import RenderCache
+    from wipyg.pool import WidgetPool
+    from wipyg.loader import LayoutPlan, compile_layout, load_layout
@@ -1,14 +1,44 @@
 # -*- coding: utf-8 -*-
 """Provides the base abstract class : Widget and the abstract Container, GridContainer and Button."""
 
+import weakref
 from abc import ABC, abstractmethod
 from typing import DefaultDict, Tuple
-from pygame.sprite import *
+from pygame.sprite import Sprite, AbstractGroup, Group
 from pygame.event import Event, custom_type, post
 from pygame.rect import Rect
+from pygame.surface import Surface
+from pygame.display import get_surface
+from wipyg.focus import FocusManager
+from wipyg.resources import get_scale, scaled, get_render_cache
 from pygame.constants import *
 
 
+def _blits(target: Surface, blits: list):
+    """Blit the (image, rect) pairs on target in a single call"""
+    if hasattr(target, "fblits"):
+        target.fblits(blits)
+    else:
+        target.blits(blits, doreturn=False)
+
+
+class _Drawn:
+    """The image and rect attributes of the widgets, telling the container when they are replaced
+
+    Without __get__, reading the attribute is the usual lookup in the instance
+    dict, only assigning it costs a call.
+    """
+
+    def __set_name__(self, owner, name: str):
+        self._name = name
+
+    def __set__(self, w, value):
+        w.__dict__[self._name] = value
+        container = w.__dict__.get("container")
+        if container is not None and container._batch is not None:
+            container._stale.add(w)
+
+
 class Widget(Sprite, ABC):
     """Abstract class for widgets, extends Sprite
 
@@ -25,6 +55,40 @@ class Widget(Sprite, ABC):
         Disable the widget so that it doesn't react to events anymore
     enable()
         Enable the widget to react to events
+    draw(surface : Surface, pos : (int, int))
+        Draw the widget on surface with its topleft corner at pos
+    invalidate()
+        Mark the widget and its containers as needing to be updated and drawn again
+    next_timer() -> int
+        When (in `pygame.time.get_ticks()` milliseconds) the widget must be updated even if nothing happens
+    surface_bytes() -> int
+        Memory used by the pixels of the surfaces cached by the widget
+    subtree_bytes() -> int
+        Memory used by the surfaces of the widget and of all its descendants
+    release()
+        Free the cached surfaces, they are redrawn when the widget is shown again
+    reset()
+        Put the widget back in its initial interaction state to reuse it, see `WidgetPool`
+    bind(attribute : str, observable : Observable)
+        Keep the attribute equal to the value of observable, updated once per frame
+    unbind(attribute : str)
+        Stop updating the attribute from its observable
+    focus()
+        Give the keyboard focus to the widget
+    capture_pointer()
+        Receive directly all the pointer events until `release_pointer` or the mouse button is released
+    release_pointer()
+        Stop capturing the pointer
+    emit(e : Event)
+        Send a custom event (like `Button.CLICKED`) from the widget
+    measure() -> (int, int)
+        The size the widget wants, first pass of the layout
+    arrange(cell : Rect)
+        Place the widget in a cell of its container, second pass of the layout
+    invalidate_layout()
+        Tell the container that the size wanted by the widget may have changed
+    rescale()
+        Load the fonts and icons again at the current scale factor and redraw the widget and its descendants
 
     Abstract methods
     ----------------
@@ -35,13 +99,55 @@ class Widget(Sprite, ABC):
     ----------
     container : Container
         The `Frame` or `Window` or other subclass of Container that contains this Widget, or `None` if independent
+    rect : Rect
+        Position and size of the Widget relative to its container (relative to the screen if independent)
+    abs_rect : Rect
+        Position and size of the Widget relative to the screen, read only
+    visible_rect : Rect
+        Part of `abs_rect` that is visible on the screen through its containers, read only
+    dirty : bool
+        Was the widget invalidated since its last update ? read only
+    display_image : Surface
+        The image converted to the pixel format of the display, used to draw the widget, read only
+    focusable : bool
+        Can the widget get the keyboard focus ? (class attribute)
+    synchronous : bool
+        Are the custom events of the widget delivered at once to it and its containers
+        rather than posted on the pygame queue ? by default False (class attribute,
+        set `Widget.synchronous = True` to change it for all the widgets)
+    focus_manager : FocusManager
+        The FocusManager of the top-level container of the tree, None if the widget isn't in a container, read only
+    scale : float
+        The scale factor of the sizes given in pixels (fonts, borders, icons), by default
+        the one of the container, or the global one of `wipyg.resources.set_scale`
     """
 
+    focusable = False
+    synchronous = False
+    # set by the FocusManager on the widgets that already reacted to the event it routes
+    _muted = False
+    image = _Drawn()
+    rect = _Drawn()
+
     def __init__(self) -> None:
         super().__init__()
         self._reactions = DefaultDict(list)
         self.container = None
         self._enabled = True
+        self._abs_key = None
+        self._abs_rect = None
+        self._dirty = True
+        self._released = False
+        self._bindings = {}
+        self._pending = set()
+        # the size returned by measure() the last time the container asked
+        self._desired = None
+        # (image, converted copy of image or None)
+        self._display = None
+        # the scale factor set on this widget, None to use the one of its container
+        self._scale = None
+        # the scale factor of the loaded fonts and icons
+        self._applied_scale = get_scale()
 
     def react(self, event: Event):
         """Loops through the callbacks installed through `add_reaction` and call the appropriates one for the event type
@@ -58,13 +164,158 @@ class Widget(Sprite, ABC):
         bool
             Must the propagation of the event to containers be stopped ?
         """
-        if self._enabled:
+        if self._enabled and not self._muted:
             stop_propagation = False
             for reaction in self._reactions[event.type]:
                 stop = reaction(self, event)
                 stop_propagation = stop_propagation or stop
             return stop_propagation
 
+    def _react_self(self, event: Event):
+        """Call the reactions of this widget only, not the ones of its children"""
+        return Widget.react(self, event)
+
+    def measure(self) -> Tuple[int, int]:
+        """Return the size the widget wants, first pass of the layout
+
+        By default the size of the rect, as set by `redraw`.
+
+        Returns
+        -------
+        (int, int)
+            width and height
+        """
+        return self.rect.size
+
+    def arrange(self, cell: Rect):
+        """Place the widget in a cell of its container, second pass of the layout
+
+        By default the widget keeps its size and is centered in the cell.
+
+        Parameters
+        ----------
+        cell : Rect
+            The space given to the widget, relative to its container
+        """
+        self.rect.center = cell.center
+
+    def invalidate_layout(self):
+        """Tell the container that the size wanted by the widget may have changed
+
+        To call after a `redraw` that can change the size of the widget, the
+        container only lays out its children again if that size really changed.
+        """
+        size = self.measure()
+        if size != self._desired:
+            old = self._desired
+            self._desired = size
+            if self.container is not None:
+                self.container._child_resized(self, old)
+        self.invalidate()
+
+    def rescale(self):
+        """Load the fonts and icons again at the current scale factor and redraw the widget and its descendants
+
+        The widgets aren't created again, and the containers of the subtree are
+        laid out once after all their children were redrawn.
+        """
+        self._rescale()
+        self.invalidate_layout()
+
+    def _rescale(self):
+        """Apply the scale factor to the subtree without telling the container"""
+        self._applied_scale = self.scale
+        self._load_resources()
+        self._released = False
+        self.redraw()
+
+    def _load_resources(self):
+        """Load the fonts and icons at the current scale factor, called by `rescale`"""
+        pass
+
+    def _px(self, value: int) -> int:
+        """Return a length in pixels multiplied by the scale factor"""
+        return scaled(value, self.scale)
+
+    def _render_key(self, cache) -> tuple:
+        """Return everything the image depends on, to find it in the render cache
+
+        See `wipyg.diskcache.RenderCache`, by default the image isn't cached.
+
+        Returns
+        -------
+        tuple
+            None if the image can't be cached
+        """
+        return None
+
+    def _cached_render(self) -> Tuple[Surface, tuple]:
+        """Look the image up in the installed render cache
+
+        Returns
+        -------
+        (Surface, tuple)
+            The cached image or None, and the key to store the image once it is drawn, None if it can't be cached
+        """
+        cache = get_render_cache()
+        if cache is None:
+            return None, None
+        key = self._render_key(cache)
+        if key is None:
+            return None, None
+        return cache.get(key), key
+
+    def _store_render(self, key: tuple):
+        """Store the image in the render cache, under the key given by `_cached_render`"""
+        cache = get_render_cache()
+        if key is not None and cache is not None:
+            cache.put(key, self.image)
+
+    def _get_scale(self) -> float:
+        w = self
+        while w._scale is None:
+            w = w.container
+            if w is None:
+                return get_scale()
+        return w._scale
+
+    def _set_scale(self, scale: float):
+        if scale is not None and scale <= 0:
+            raise ValueError("The scale factor must be positive")
+        self._scale = scale
+        self.rescale()
+
+    scale = property(
+        _get_scale,
+        _set_scale,
+        doc="""The scale factor of the sizes given in pixels
+
+        Set it on the top-level container to scale a whole tree, None to use the
+        one of the container again. Changing it calls `rescale`.""",
+    )
+
+    def emit(self, event: Event):
+        """Send a custom event from the widget
+
+        If `synchronous` is False the event is posted on the pygame queue, so the
+        main loop gives it to every widget at the next frame. Otherwise it is
+        given right now to the reactions of the widget, then of its containers
+        until one stops the propagation, and never reaches the pygame queue.
+
+        Parameters
+        ----------
+        event : Event
+        """
+        if not self.synchronous:
+            post(event)
+            return
+        w = self
+        stop = False
+        while w is not None and not stop:
+            # only the reactions of the containers, not of the other children
+            stop = w._react_self(event)
+            w = w.container
+
     def add_reaction(self, type: int, callback) -> Tuple[int, int]:
         """Add a callback to react to event of a certain type via `react`
 
@@ -103,6 +354,296 @@ class Widget(Sprite, ABC):
         """Enable the widget to react to events"""
         self._enabled = True
 
+    def update(self, *args, **kwargs) -> None:
+        self._apply_bindings()
+        self._dirty = False
+
+    def bind(self, attribute: str, observable):
+        """Keep an attribute equal to the value of an observable
+
+        The attribute is set during `update`, so it changes at most once per frame,
+        with the latest value, however often the value changes between frames.
+
+        Parameters
+        ----------
+        attribute : str
+            Name of a property of the widget, like "text" for a `Label`, "value"
+            for an `Entry`, "state" for a `Button` or "bg_color" for a `Frame`
+        observable : Observable
+            Where the value comes from
+        """
+        self.unbind(attribute)
+        # the observable mustn't keep a killed widget alive
+        ref = weakref.ref(self)
+
+        def changed(o):
+            w = ref()
+            if w is None:
+                o.unsubscribe(id)
+            elif attribute not in w._pending:
+                w._pending.add(attribute)
+                w.invalidate()
+
+        id = observable.subscribe(changed)
+        self._bindings[attribute] = (observable, id)
+        self._pending.add(attribute)
+        self.invalidate()
+
+    def unbind(self, attribute: str):
+        """Stop updating an attribute from its observable
+
+        Parameters
+        ----------
+        attribute : str
+            Name of the bound attribute
+        """
+        if attribute in self._bindings:
+            observable, id = self._bindings.pop(attribute)
+            observable.unsubscribe(id)
+            self._pending.discard(attribute)
+
+    def _apply_bindings(self):
+        """Set the attributes whose observable changed since the last update"""
+        if self._pending:
+            pending = self._pending
+            self._pending = set()
+            for attribute in pending:
+                setattr(self, attribute, self._bindings[attribute][0].value)
+
+    def invalidate(self):
+        """Mark the widget and its containers as needing to be updated and drawn again"""
+        w = self
+        while w is not None:
+            w._dirty = True
+            w = w.container
+
+    def _get_dirty(self) -> bool:
+        return self._dirty
+
+    dirty = property(
+        _get_dirty, doc="Was the widget invalidated since its last update ?"
+    )
+
+    def next_timer(self) -> int:
+        """When the widget must be updated again even if nothing happens (to animate it)
+
+        Returns
+        -------
+        int
+            A time in milliseconds, as given by `pygame.time.get_ticks()`, or None if the widget is static
+        """
+        return None
+
+    def _surfaces(self) -> list:
+        """Return the surfaces owned (and cached) by the widget"""
+        image = getattr(self, "image", None)
+        return ([] if image is None else [image]) + self._display_surfaces()
+
+    def _display_surfaces(self) -> list:
+        """Return the copy of the image converted for the display, if there is one"""
+        if self._display is None or self._display[1] is None:
+            return []
+        return [self._display[1]]
+
+    def surface_bytes(self) -> int:
+        """Memory used by the pixels of the surfaces cached by the widget
+
+        Subsurfaces and surfaces shared with other widgets (like the icons of an
+        `IconButton`) aren't counted.
+
+        Returns
+        -------
+        int
+            A number of bytes
+        """
+        surfaces = {id(s): s for s in self._surfaces() if s is not None}
+        return sum(
+            s.get_pitch() * s.get_height()
+            for s in surfaces.values()
+            if s.get_parent() is None
+        )
+
+    def subtree_bytes(self) -> int:
+        """Memory used by the surfaces of the widget and of all its descendants
+
+        Returns
+        -------
+        int
+            A number of bytes
+        """
+        return self.surface_bytes()
+
+    def release(self):
+        """Free the cached surfaces, they are redrawn when the widget is shown again
+
+        The rect is kept so the layout doesn't change while the widget is released.
+        """
+        self.image = Surface((0, 0), SRCALPHA)
+        self._released = True
+        self._display = None
+        if self.container is not None:
+            # the blits sequence of the container still references the image
+            self.container._batch_children = None
+            self.container._batch = None
+
+    def reset(self):
+        """Put the widget back in its initial interaction state to reuse it
+
+        Called by `wipyg.pool.WidgetPool` on the killed widgets it recycles, a
+        pressed button is released, a minimized Window is restored, and so on.
+        The texts and values are kept, they are given by the pool.
+        """
+        pass
+
+    def _restore(self):
+        """Redraw the widget if it was released"""
+        if self._released:
+            self._released = False
+            self.redraw()
+
+    def _get_focus_manager(self) -> FocusManager:
+        root = self
+        while root.container is not None:
+            root = root.container
+        if not isinstance(root, Container):
+            return None
+        if root._focus_manager is None:
+            root._focus_manager = FocusManager(root)
+        return root._focus_manager
+
+    focus_manager = property(
+        _get_focus_manager,
+        doc="The FocusManager of the top-level container, None if the widget isn't in a container",
+    )
+
+    def focus(self):
+        """Give the keyboard focus to the widget, if it is in a container"""
+        manager = self.focus_manager
+        if manager is not None:
+            manager.focus(self)
+
+    def capture_pointer(self):
+        """Receive directly all the MOUSEMOTION and MOUSEBUTTONUP events
+
+        The other widgets of the tree don't see them until `release_pointer` is
+        called or the mouse button is released. Typically called on MOUSEBUTTONDOWN
+        to drag something. Does nothing if the widget isn't in a container.
+        """
+        manager = self.focus_manager
+        if manager is not None:
+            manager.capture_pointer(self)
+
+    def release_pointer(self):
+        """Stop capturing the pointer"""
+        manager = self.focus_manager
+        if manager is not None:
+            manager.release_pointer(self)
+
+    def _wants_focus(self) -> bool:
+        """Must the widget get the focus when it is added to a container ?"""
+        return False
+
+    def _on_focus(self):
+        """Called by the FocusManager when the widget gets the focus"""
+        pass
+
+    def _on_blur(self):
+        """Called by the FocusManager when the widget loses the focus"""
+        pass
+
+    def _hit(self, pos: Tuple[int, int]) -> bool:
+        """Is the point pos (relative to the screen) on the widget ? By default anywhere in its rect"""
+        return self.abs_rect.collidepoint(pos)
+
+    def _get_abs_rect(self) -> Rect:
+        if self.container is None:
+            return self.rect
+        # the cache stays valid as long as neither this widget nor one of its
+        # ancestors moved or was resized, checking it only costs a walk up the tree
+        origin = self.container.abs_rect.topleft
+        key = (origin, tuple(self.rect))
+        if self._abs_key != key:
+            self._abs_key = key
+            self._abs_rect = self.rect.move(origin)
+        return self._abs_rect
+
+    abs_rect = property(
+        _get_abs_rect,
+        doc="Rect of the Widget relative to the screen (don't modify it, move `rect` instead)",
+    )
+
+    def _get_visible_rect(self) -> Rect:
+        if self.container is not None:
+            return self.abs_rect.clip(self.container.visible_rect)
+        screen = get_surface()
+        if screen is None:
+            return self.abs_rect.copy()
+        return self.abs_rect.clip(screen.get_rect())
+
+    visible_rect = property(
+        _get_visible_rect,
+        doc="Part of abs_rect that isn't outside the screen or the visible area of the containers",
+    )
+
+    def _get_opaque(self) -> bool:
+        return False
+
+    opaque = property(
+        _get_opaque,
+        doc="Does the image of the Widget entirely cover its rect with opaque pixels ?",
+    )
+
+    def _get_display_image(self) -> Surface:
+        image = self.image
+        display = self._display
+        if display is not None and display[0] is image:
+            if display[1] is None:
+                # drawn again without being redrawn, worth the cost of RLE encoding
+                # (the alpha must be set to 255, None would drop the per-pixel alpha)
+                converted = image.convert_alpha()
+                converted.set_alpha(255, RLEACCEL)
+                self._display = (image, converted)
+                return converted
+            return display[1]
+        if get_surface() is None:
+            return image
+        # an opaque image doesn't need alpha blending at all
+        converted = image.convert() if self.opaque else None
+        self._display = (image, converted)
+        return image if converted is None else converted
+
+    display_image = property(
+        _get_display_image,
+        doc="""The image converted to the pixel format of the display
+
+        The conversion is cached until `image` is replaced by another Surface, a
+        widget painting on its image in place must then call `_image_changed`.
+        Opaque images are converted without alpha, the other ones are converted
+        with RLE acceleration when they are drawn a second time.""",
+    )
+
+    def _image_changed(self):
+        """To call after painting on the image in place rather than replacing it"""
+        # the converted copy of the image and the one blitted by the container are outdated
+        self._display = None
+        container = self.container
+        if container is not None and container._batch is not None:
+            container._stale.add(self)
+
+    def draw(self, surface: Surface, pos: Tuple[int, int] = None):
+        """Draw the widget on surface
+
+        Parameters
+        ----------
+        surface : Surface
+            Where to draw the Widget, usually the screen
+        pos : (int, int), optional
+            Position of the topleft corner of the Widget on surface, by default `rect.topleft`
+        """
+        if pos is None:
+            pos = self.rect.topleft
+        surface.blit(self.display_image, pos)
+
     @abstractmethod
     def redraw(self):
         """Redraw the image attribute to reflect the state of the Widget, normally implemented by a subclass and shouldn't have to be manually called
@@ -119,17 +660,43 @@ class Widget(Sprite, ABC):
 class Container(Widget, ABC):
     """Abstract class for a Widget that can contain other widgets
 
+    By default a container composes the images of its children in its own image.
+    In direct mode, its image only holds its own decorations and `draw` paints
+    the children directly on a subsurface of the target surface, so there is
+    no intermediate copy of the children, a direct container must then be drawn
+    with `draw` rather than by a `pygame.sprite.Group`.
+
+    The layout is done in two passes: `measure` computes the size the widget
+    wants from the sizes cached for its children, then `layout` (called by
+    `update` when needed) places the children with their `arrange` method.
+    Painting with `redraw` never changes the layout.
+
     Methods
     -------
     add_widget(w : Widget)
         Add w to the container and change w.container
     del_widget(w : Widget)
         Delete the widget from the container and set w.container to None
+    layout()
+        Set the size of the container and place its children
+
+    Attributes
+    ----------
+    direct : bool
+        Are the children drawn directly on the target surface rather than in the container image ?
     """
 
     def __init__(self) -> None:
         super().__init__()
         self._widgets = []
+        self._direct = False
+        self._batch_children = None
+        self._batch = None
+        # the position of each child in the blits sequence, and those to refresh
+        self._batch_index = {}
+        self._stale = set()
+        self._focus_manager = None
+        self._layout_dirty = True
 
     def kill(self) -> None:
         super().kill()
@@ -137,19 +704,191 @@ class Container(Widget, ABC):
             w.kill()
 
     def react(self, event: Event):
+        if self.container is None and self._route(event):
+            return
+        if not self._dispatch(event):
+            super().react(event)
+
+    def _route(self, event: Event) -> bool:
+        """At the top-level, send the event only to the focused or capturing widget if there is one"""
+        if event.type in FocusManager.EVENTS:
+            return self.focus_manager.route(event)
+        if event.type in FocusManager.POINTER and self._focus_manager is not None:
+            return self._focus_manager.route_pointer(event)
+        return False
+
+    def _dispatch(self, event: Event) -> bool:
+        """Send the event to the children, return True if one of them stopped its propagation"""
         stop_propagation = False
         for w in self._widgets:
             if isinstance(w, Widget):
                 stop = w.react(event)
                 stop_propagation = stop_propagation or stop
-        if not stop_propagation:
-            super().react(event)
+        return stop_propagation
 
     def update(self, *args, **kwargs) -> None:
+        self._apply_bindings()
+        if self._layout_dirty:
+            self.layout()
+        # children entirely outside of the visible area are neither updated nor redrawn
+        view = self._local_view()
+        if view.width and view.height:
+            for w in self._widgets:
+                if view.colliderect(w.rect):
+                    if w._released:
+                        w._restore()
+                    w.update()
+            # updating the children may have changed their sizes
+            if self._layout_dirty:
+                self.layout()
+            self.redraw()
+        self._dirty = False
+
+    def layout(self):
+        """Set the size of the container and place its children, second pass of the layout
+
+        Called by `update` when the size of a child changed, by default the
+        children keep their positions.
+        """
+        self._layout_dirty = False
+
+    def _child_resized(self, w: Widget, old: Tuple[int, int]):
+        """The size wanted by the child w changed from old (None if unknown) to w._desired"""
+        self._layout_dirty = True
+        self.invalidate_layout()
+
+    def _rescale(self):
         for w in self._widgets:
-            w.update()
+            if isinstance(w, Widget):
+                w._rescale()
+        self._applied_scale = self.scale
+        self._load_resources()
+        self._released = False
+        # a single layout once all the children have their new size
+        self._refresh_dims()
+        self.layout()
         self.redraw()
 
+    def _refresh_dims(self):
+        """Measure the children again, first pass of the layout"""
+        for w in self._widgets:
+            if isinstance(w, Widget):
+                w._desired = w.measure()
+
+    def subtree_bytes(self) -> int:
+        return self.surface_bytes() + sum(
+            w.subtree_bytes() for w in self._widgets if isinstance(w, Widget)
+        )
+
+    def reset(self):
+        for w in self._widgets:
+            if isinstance(w, Widget):
+                w.reset()
+
+    def release(self):
+        for w in self._widgets:
+            if isinstance(w, Widget):
+                w.release()
+        super().release()
+        self._batch_children = None
+        self._batch = None
+
+    def next_timer(self) -> int:
+        timers = [w.next_timer() for w in self._widgets]
+        timers = [t for t in timers if t is not None]
+        return min(timers) if timers else None
+
+    def _local_view(self) -> Rect:
+        """Return the visible part of the container relative to its own topleft corner"""
+        abs_rect = self.abs_rect
+        return self.visible_rect.move(-abs_rect.x, -abs_rect.y)
+
+    def _drawn_children(self) -> list:
+        """Return the children to draw, from the bottom to the top"""
+        return self._widgets
+
+    def _build_batch(self, children: list) -> list:
+        """Group the children in runs that can be blitted with a single call
+
+        A run is either a list of (image, rect) pairs for `Surface.blits` or a
+        direct container that must draw itself. The pairs of the children are
+        refreshed by `_compose` when their image or rect is replaced.
+        """
+        runs = []
+        blits = []
+        index = {}
+        for w in children:
+            if isinstance(w, Container) and w._direct:
+                if blits:
+                    runs.append(blits)
+                    blits = []
+                runs.append(w)
+            else:
+                index[w] = (blits, len(blits))
+                blits.append((w.image, w.rect))
+        if blits:
+            runs.append(blits)
+        self._batch_index = index
+        # the display images are looked up at the first composition
+        self._stale = set(index)
+        return runs
+
+    def _compose(self, target: Surface):
+        """Draw the visible children on target, which is the size of the container"""
+        children = self._drawn_children()
+        # the blits sequence is kept as long as the children don't change
+        if self._batch_children != children:
+            self._batch_children = list(children)
+            self._batch = self._build_batch(children)
+
+        if self._stale:
+            self._refresh_batch()
+
+        # SDL rejects the blits outside of the clip area faster than we could
+        target.set_clip(self._local_view())
+        for run in self._batch:
+            if isinstance(run, Widget):
+                run.draw(target, run.rect.topleft)
+            else:
+                _blits(target, run)
+        target.set_clip(None)
+
+    def _refresh_batch(self):
+        """Update the pairs of the children whose image or rect was replaced"""
+        stale = self._stale
+        self._stale = set()
+        index = self._batch_index
+        for w in stale:
+            entry = index.get(w)
+            if entry is None:
+                continue
+            blits, i = entry
+            blits[i] = (w.display_image, w.rect)
+            display = w._display
+            if display is not None and display[1] is None:
+                # converted with RLE acceleration when it is drawn again
+                self._stale.add(w)
+
+    def draw(self, surface: Surface, pos: Tuple[int, int] = None):
+        if pos is None:
+            pos = self.rect.topleft
+        if not self._direct:
+            return super().draw(surface, pos)
+
+        area = Rect(pos, self.rect.size).clip(surface.get_clip())
+        if not (area.width and area.height):
+            return
+        # the children paint directly in the part of surface covered by the container
+        view = surface.subsurface(area)
+        dx, dy = pos[0] - area.x, pos[1] - area.y
+        view.blit(self.display_image, (dx, dy))
+        local = area.move(-pos[0], -pos[1])
+        for w in self._drawn_children():
+            if local.colliderect(w.rect):
+                if w._released:
+                    w._restore()
+                w.draw(view, (w.rect.x + dx, w.rect.y + dy))
+
     def add_widget(self, w: Widget):
         """Add w to the container and change w.container
 
@@ -160,6 +899,19 @@ class Container(Widget, ABC):
         self._widgets.append(w)
         if isinstance(w, Widget):
             w.container = self
+            # w was built at another scale than the one of this tree
+            if w._applied_scale != w.scale:
+                w._rescale()
+            # the focus of a subtree is now managed by the top-level container
+            focused = None
+            if isinstance(w, Container) and w._focus_manager is not None:
+                focused = w._focus_manager.focused
+                w._focus_manager = None
+            elif w._wants_focus():
+                focused = w
+            if focused is not None:
+                self.focus_manager.focus(focused)
+        self.invalidate()
 
     def del_widget(self, w: Widget):
         """Delete the widget from the container, set w.container to None and call w.kill()
@@ -171,6 +923,21 @@ class Container(Widget, ABC):
         self._widgets.remove(w)
         if isinstance(w, Widget):
             w.container = None
+        self.invalidate()
+
+    def _get_direct(self) -> bool:
+        return self._direct
+
+    def _set_direct(self, direct: bool):
+        self._direct = direct
+        self.redraw()
+        self.invalidate()
+
+    direct = property(
+        _get_direct,
+        _set_direct,
+        doc="Are the children drawn directly on the target surface by `draw` rather than composed in the image ?",
+    )
 
     def disable(self):
         for w in self._widgets:
@@ -185,17 +952,57 @@ class Container(Widget, ABC):
         super().enable()
 
 
+def _grow(dims: list, start: int, span: int, needed: int, weights: list):
+    """Enlarge dims[start:start + span] so that their sum is at least needed
+
+    The missing space goes to the weighted dimensions, or to the last one if
+    none of them has a weight.
+    """
+    missing = needed - sum(dims[start : start + span])
+    if missing > 0:
+        dims[start : start + span] = _stretch(
+            dims[start : start + span], missing, weights[start : start + span]
+        )
+
+
+def _stretch(dims: list, extra: int, weights: list) -> list:
+    """Return a copy of dims with extra distributed proportionally to weights"""
+    dims = list(dims)
+    total = sum(weights)
+    if extra <= 0 or not dims:
+        return dims
+    if not total:
+        dims[-1] += extra
+        return dims
+    given = 0
+    last = max(i for i, weight in enumerate(weights) if weight)
+    for i, weight in enumerate(weights):
+        if weight:
+            part = extra - given if i == last else extra * weight // total
+            dims[i] += part
+            given += part
+    return dims
+
+
 class GridContainer(Container, ABC):
     """Abstract class for a container that place its widgets on a grid
 
+    A widget may span several columns and lines. The columns and lines are as
+    large as the widgets they contain, and share the extra space given to the
+    container according to their weights (by default 0, they don't stretch).
+    When the size of a child changes, the sizes of the columns and lines are
+    only computed again if its column or line is affected.
+
     Methods
     -------
-    set_grid(col : int, line : int, w : Widget)
+    set_grid(col : int, line : int, w : Widget, colspan : int, linespan : int)
         Put a Widget on the given position, extending the grid if necessary
     get_grid(col : int, line : int) -> Widget
         Get the Widget in a certain position of the grid
     del_cell(col : int, line : int) -> Widget
         Remove the Widget in the given position from the grid and from the container
+    layout(size : (int, int))
+        Set the size of the container and place its children in their cells
 
     Attributes
     ----------
@@ -203,6 +1010,10 @@ class GridContainer(Container, ABC):
         Number of columns in the grid
     lines : int
         Number of lines in the grid
+    column_weights : list[int]
+        How the extra width is shared between the columns
+    line_weights : list[int]
+        How the extra height is shared between the lines
     """
 
     def __init__(self) -> None:
@@ -214,34 +1025,154 @@ class GridContainer(Container, ABC):
         self._columns = 1
         self._lines = 1
         self._grid_rect = Rect(0, 0, 0, 0)
+        self._spans = {}
+        self._positions = {}
+        self._column_weights = [0]
+        self._line_weights = [0]
+        self._extent = None
 
-    def _compute_cells(self):
+    def _compute_cells(self, xdims: list, ydims: list):
         """compute a matrix of rectangles corresponding to the grid and its dimensions"""
         cells = [[None for x in range(self.columns)] for y in range(self.lines)]
         y_offset = 0
         for y in range(self.lines):
             x_offset = 0
             for x in range(self.columns):
-                cells[y][x] = Rect(x_offset, y_offset, self._xdims[x], self._ydims[y])
-                x_offset += self._xdims[x]
-            y_offset += self._ydims[y]
+                cells[y][x] = Rect(x_offset, y_offset, xdims[x], ydims[y])
+                x_offset += xdims[x]
+            y_offset += ydims[y]
         return cells
 
-    def _refresh_dims(self):
-        """Refresh the _xdims, _ydims and _grid_rect attributes"""
-        self._xdims = [0] * self.columns
-        self._ydims = [0] * self.lines
+    def _anchors(self):
+        """Iterate over the (line, column, widget) of the widgets in the grid"""
         for i in range(self._lines):
             for j in range(self._columns):
                 w = self._grid[i][j]
                 if isinstance(w, Sprite):
-                    self._xdims[j] = max(self._xdims[j], w.rect.width)
-                    self._ydims[i] = max(self._ydims[i], w.rect.height)
+                    yield i, j, w
+
+    def _refresh_dims(self):
+        """Refresh the _xdims, _ydims and _grid_rect attributes, first pass of the layout"""
+        self._xdims = [0] * self.columns
+        self._ydims = [0] * self.lines
+        self._positions = {}
+        spanning = []
+        for i, j, w in self._anchors():
+            self._positions[w] = (i, j)
+            w._desired = width, height = w.measure()
+            colspan, linespan = self._spans.get(w, (1, 1))
+            if colspan == 1:
+                self._xdims[j] = max(self._xdims[j], width)
+            if linespan == 1:
+                self._ydims[i] = max(self._ydims[i], height)
+            if colspan > 1 or linespan > 1:
+                spanning.append((i, j, w))
+        # the widgets spanning several cells only enlarge them if they don't fit
+        self._spans = {w: self._spans[w] for _, _, w in spanning}
+        for i, j, w in spanning:
+            colspan, linespan = self._spans[w]
+            _grow(self._xdims, j, colspan, w._desired[0], self._column_weights)
+            _grow(self._ydims, i, linespan, w._desired[1], self._line_weights)
         self._grid_rect.width = sum(self._xdims)
         self._grid_rect.height = sum(self._ydims)
-        self._cells = self._compute_cells()
 
-    def set_grid(self, col: int, line: int, w: Widget):
+    def _grid_changed(self):
+        """Measure the grid again after a change of its structure"""
+        self._refresh_dims()
+        self._layout_dirty = True
+        self.invalidate_layout()
+
+    def measure(self) -> Tuple[int, int]:
+        return self._grid_rect.size
+
+    def _child_resized(self, w: Widget, old: Tuple[int, int]):
+        if w not in self._positions:
+            return
+        if old is None or self._spans:
+            # the spanning widgets make the dimensions depend on each other
+            xdims, ydims = self._xdims, self._ydims
+            self._refresh_dims()
+            changed = xdims != self._xdims or ydims != self._ydims
+        else:
+            i, j = self._positions[w]
+            width, height = w._desired
+            xdim, ydim = self._xdims[j], self._ydims[i]
+            # a column (or line) only shrinks if w was one of its largest widgets
+            if width < xdim:
+                width = (
+                    xdim
+                    if old[0] < xdim
+                    else max(
+                        self._grid[y][j]._desired[0]
+                        for y in range(self._lines)
+                        if isinstance(self._grid[y][j], Sprite)
+                    )
+                )
+            if height < ydim:
+                height = (
+                    ydim
+                    if old[1] < ydim
+                    else max(
+                        self._grid[i][x]._desired[1]
+                        for x in range(self._columns)
+                        if isinstance(self._grid[i][x], Sprite)
+                    )
+                )
+            self._xdims[j], self._ydims[i] = width, height
+            changed = width != xdim or height != ydim
+            self._grid_rect.size = sum(self._xdims), sum(self._ydims)
+
+        if changed:
+            self._layout_dirty = True
+            self.invalidate_layout()
+        elif not self._layout_dirty:
+            # the cells didn't change, only w must be placed again
+            i, j = self._positions[w]
+            w.arrange(self._cell(i, j, w))
+            self.invalidate()
+
+    def _cell(self, i: int, j: int, w: Widget) -> Rect:
+        """Return the area of the cells covered by w, placed at line i and column j"""
+        colspan, linespan = self._spans.get(w, (1, 1))
+        return self._cells[i][j].union(self._cells[i + linespan - 1][j + colspan - 1])
+
+    def layout(self, size: Tuple[int, int] = None):
+        """Set the size of the container and place its children in their cells
+
+        Parameters
+        ----------
+        size : (int, int), optional
+            The space given to the container, by default the last one given. The
+            extra space is shared between the weighted columns and lines, the
+            container keeps the size it wants in a direction without weights.
+        """
+        if size is not None:
+            self._extent = tuple(size)
+        width, height = self._grid_rect.size
+        xdims, ydims = self._xdims, self._ydims
+        if self._extent is not None:
+            if any(self._column_weights):
+                xdims = _stretch(xdims, self._extent[0] - width, self._column_weights)
+            if any(self._line_weights):
+                ydims = _stretch(ydims, self._extent[1] - height, self._line_weights)
+        self._cells = self._compute_cells(xdims, ydims)
+        self.rect.size = sum(xdims), sum(ydims)
+        for i, j, w in self._anchors():
+            w.arrange(self._cell(i, j, w))
+        self._layout_dirty = False
+
+    def arrange(self, cell: Rect):
+        # the children are only placed again if the space given changed
+        if self._layout_dirty or cell.size != self._extent:
+            size = self.rect.size
+            self.layout(cell.size)
+            if self.rect.size != size:
+                self.redraw()
+        self.rect.center = cell.center
+
+    def set_grid(
+        self, col: int, line: int, w: Widget, colspan: int = 1, linespan: int = 1
+    ):
         """Put a Widget on the given position, extending the grid if necessary
 
         Parameters
@@ -252,15 +1183,23 @@ class GridContainer(Container, ABC):
             line where the widget is placed
         w : Widget
             Widget to place
+        colspan : int, optional
+            number of columns covered by the Widget, by default 1
+        linespan : int, optional
+            number of lines covered by the Widget, by default 1
         """
-        if col > self._columns:
-            self.columns = col
-        if line > self._lines:
-            self.lines = line
+        if colspan < 1 or linespan < 1:
+            raise ValueError("colspan and linespan must be at least 1")
+        if col + colspan - 1 > self._columns:
+            self.columns = col + colspan - 1
+        if line + linespan - 1 > self._lines:
+            self.lines = line + linespan - 1
         self._grid[line - 1][col - 1] = w
+        if colspan > 1 or linespan > 1:
+            self._spans[w] = (colspan, linespan)
         self.add_widget(w)
 
-        self._refresh_dims()
+        self._grid_changed()
 
     def get_grid(self, col: int, line: int) -> Widget:
         """Get the Widget in a certain position of the grid
@@ -303,7 +1242,7 @@ class GridContainer(Container, ABC):
             self._grid[line - 1][col - 1] = None
             self.del_widget(w)
 
-        self._refresh_dims()
+        self._grid_changed()
         return w
 
     def _get_lines(self):
@@ -323,7 +1262,8 @@ class GridContainer(Container, ABC):
                 self._grid.append([None for _ in range(self._columns)])
 
         self._lines = lines
-        self._refresh_dims()
+        self._line_weights = (self._line_weights + [0] * lines)[:lines]
+        self._grid_changed()
 
     lines = property(
         _get_lines,
@@ -348,7 +1288,8 @@ class GridContainer(Container, ABC):
                 line.extend([None for _ in range(self._columns, columns)])
 
         self._columns = columns
-        self._refresh_dims()
+        self._column_weights = (self._column_weights + [0] * columns)[:columns]
+        self._grid_changed()
 
     columns = property(
         _get_columns,
@@ -356,6 +1297,40 @@ class GridContainer(Container, ABC):
         doc="Number of columns, setting it may destroy some columns of Widgets",
     )
 
+    def _weights(self, weights: list, count: int) -> list:
+        weights = list(weights)
+        if len(weights) > count or any(weight < 0 for weight in weights):
+            raise ValueError(
+                "there must be at most one positive weight per column or line"
+            )
+        return weights + [0] * (count - len(weights))
+
+    def _get_column_weights(self) -> list:
+        return list(self._column_weights)
+
+    def _set_column_weights(self, weights: list):
+        self._column_weights = self._weights(weights, self._columns)
+        self._grid_changed()
+
+    column_weights = property(
+        _get_column_weights,
+        _set_column_weights,
+        doc="How the extra width is shared between the columns, missing weights are 0",
+    )
+
+    def _get_line_weights(self) -> list:
+        return list(self._line_weights)
+
+    def _set_line_weights(self, weights: list):
+        self._line_weights = self._weights(weights, self._lines)
+        self._grid_changed()
+
+    line_weights = property(
+        _get_line_weights,
+        _set_line_weights,
+        doc="How the extra height is shared between the lines, missing weights are 0",
+    )
+
 
 class Button(Widget, ABC):
     """Abstract class for a Widget that can be "clicked" and can be in an "active", "inactive" or "disabled" state
@@ -364,7 +1339,7 @@ class Button(Widget, ABC):
     -------------
     Button.CLICKED
         launched if the mouse has a left MOUSEBUTTONUP on this button,
-        contains a "button" attribute
+        contains a "button" attribute, see `Widget.emit`
 
     Attributes
     ----------
@@ -378,14 +1353,14 @@ class Button(Widget, ABC):
     DISABLED = 2
 
     def _mouse_down(self, source, e):
-        if self.rect.collidepoint(e.pos):
+        if self._hit(e.pos):
             self.state = Button.ACTIVE
 
     def _mouse_up(self, source, e):
         if self.state == Button.ACTIVE:
             self.state = Button.INACTIVE
-        if self.rect.collidepoint(e.pos):
-            post(Event(Button.CLICKED, {"button": self}))
+        if self._hit(e.pos):
+            self.emit(Event(Button.CLICKED, {"button": self}))
 
     def __init__(self, state: int = 0) -> None:
         super().__init__()
@@ -396,6 +1371,11 @@ class Button(Widget, ABC):
     def react(self, e: Event):
         return super().react(e)
 
+    def reset(self):
+        # killed while the mouse button was pressed on it
+        if self._state == Button.ACTIVE:
+            self.state = Button.INACTIVE
+
     def _get_state(self):
         return self._state
 
@@ -406,6 +1386,7 @@ class Button(Widget, ABC):
         else:
             self.enable()
         self.redraw()
+        self.invalidate()
 
     state = property(
         _get_state,
@@ -0,0 +1,79 @@
+# -*- coding: utf-8 -*-
+"""Provide observable values that widget attributes can be bound to."""
+
+from typing import Callable
+
+
+class Observable:
+    """A value that notifies its subscribers when it changes
+
+    Bind a widget attribute to it with `Widget.bind`, the widget is then updated
+    at most once per frame with the latest value however often it is changed.
+
+    Methods
+    -------
+    subscribe(callback : (Observable) -> None) -> int
+        Call callback each time the value changes, return an id for `unsubscribe`
+    unsubscribe(id : int)
+        Stop calling the callback subscribed with this id
+
+    Attributes
+    ----------
+    value
+        The current value, setting it notifies the subscribers if it changed
+    """
+
+    def __init__(self, value=None) -> None:
+        """
+        Parameters
+        ----------
+        value : optional
+            The initial value, by default None
+        """
+        self._value = value
+        self._callbacks = {}
+        self._next_id = 0
+
+    def subscribe(self, callback: Callable) -> int:
+        """Call callback each time the value changes
+
+        Parameters
+        ----------
+        callback : (Observable) -> None
+            Called with this Observable after its value changed
+
+        Returns
+        -------
+        int
+            Identifiant that can be used to unsubscribe
+        """
+        self._next_id += 1
+        self._callbacks[self._next_id] = callback
+        return self._next_id
+
+    def unsubscribe(self, id: int):
+        """Stop calling a callback
+
+        Parameters
+        ----------
+        id : int
+            The identifiant returned by `subscribe`
+        """
+        self._callbacks.pop(id, None)
+
+    def _get_value(self):
+        return self._value
+
+    def _set_value(self, value):
+        if value is self._value or value == self._value:
+            return
+        self._value = value
+        # a callback may unsubscribe itself
+        for callback in list(self._callbacks.values()):
+            callback(self)
+
+    value = property(
+        _get_value,
+        _set_value,
+        doc="The current value, setting it notifies the subscribers if it changed",
+    )
@@ -1,20 +1,35 @@
 # -*- coding: utf-8 -*-
 """Provide several buttons widget type."""
 
+import weakref
+
 from wipyg.abstracts import *
-from pygame.font import Font
-from pygame import Surface
-from pygame.draw import *
+from pygame.mask import Mask, from_surface
+from pygame import Surface, Color
+from pygame.draw import rect
+from wipyg.resources import get_font, scaled_icon
+from wipyg.skin import _by_state
 
 
 class PlainButton(Button):
     """A normal button, light grey background when INACTIVE, almost white if ACTIVE, text greyed out if DISABLED
 
-    Derive this class and override _colors to provide variations with different colors (in the three states)
+    Derive this class and override _colors to provide variations with different colors (in the three states),
+    or give it a `Skin` to draw its background from an image
+
+    Attributes
+    ----------
+    text : str
+        The text displayed on the button
     """
 
     def __init__(
-        self, text="Ok", font=None, size=30, state: int = Button.INACTIVE
+        self,
+        text="Ok",
+        font=None,
+        size=30,
+        state: int = Button.INACTIVE,
+        skin=None,
     ) -> None:
         """Create a plain button with grey background and black text
 
@@ -25,20 +40,50 @@ class PlainButton(Button):
         font : file | filename, optional
             The source file for the font, by default None, that is the default Pygame sys font
         size : int, optional
-            Font size (in pixels), by default 30
+            Font size (in pixels, multiplied by the scale factor), by default 30
         state : int, optional
             Initial state of the button, one of (Button.ACTIVE, Button.INACTIVE, Button.DISABLED), by default Button.INACTIVE
+        skin : Skin | list[Skin], optional
+            The background and border, or one for each state (indexed by the
+            states), by default None to draw them with the colors of `_colors`
         """
         super().__init__(state)
-        self._font = Font(font, size)
+        self._skins = _by_state(skin)
+        self._font_source = font
+        self._size = size
         self._text = text
         self.rect = Rect(0, 0, 0, 0)
+        self._load_resources()
         self.redraw()
 
+    def _load_resources(self):
+        self._font_size = self._px(self._size)
+        self._font = get_font(self._font_source, self._font_size)
+        self._border = self._px(3)
+
+    def _render_key(self, cache) -> tuple:
+        stamp = cache.font_stamp(self._font_source)
+        if stamp is None or self._skins[self.state] is not None:
+            return None
+        return (
+            type(self).__qualname__,
+            self._text,
+            stamp,
+            self._font_size,
+            self._border,
+            self._colors(),
+        )
+
     def redraw(self):
         bg_color, text_color = self._colors()
 
         pos = self.rect.topleft
+        image, key = self._cached_render()
+        if image is not None:
+            self._text_img = None
+            self.image = image
+            self.rect = Rect(pos, image.get_size())
+            return
         self._text_img = self._font.render(self._text, True, text_color)
 
         self._text_rect = self._text_img.get_rect()
@@ -48,13 +93,46 @@ class PlainButton(Button):
         self._text_rect.center = self.rect.center
 
         self.image = Surface(self.rect.size, SRCALPHA)
-        self.image.fill(bg_color)
-        rect(self.image, (0, 0, 0), self.rect, width=3)
+        skin = self._skins[self.state]
+        if skin is None:
+            self.image.fill(bg_color)
+            rect(self.image, (0, 0, 0), self.rect, width=self._border)
+        else:
+            self.image.blit(
+                skin.background(self.rect.size, self._applied_scale), (0, 0)
+            )
         self.image.blit(self._text_img, self._text_rect)
+        self._store_render(key)
 
         # reposition the rect as initially
         self.rect.topleft = pos
 
+    def _surfaces(self) -> list:
+        return super()._surfaces() + [self._text_img]
+
+    def _get_text(self) -> str:
+        return self._text
+
+    def _set_text(self, text: str):
+        if text != self._text:
+            self._text = text
+            self.redraw()
+            self.invalidate_layout()
+
+    text = property(_get_text, _set_text, doc="The text displayed on the button")
+
+    def _get_opaque(self) -> bool:
+        skin = self._skins[self.state]
+        if skin is not None:
+            return skin.opaque
+        return Color(self._colors()[0]).a == 255
+
+    opaque = property(_get_opaque, doc="Is the background of the button opaque ?")
+
+    def release(self):
+        self._text_img = None
+        super().release()
+
     def _colors(self):
         if self.state == Button.INACTIVE:
             bg_color = (210, 210, 210)
@@ -100,8 +178,27 @@ class SubmitButton(PlainButton):
         return bg_color, text_color
 
 
+# the masks of the icons, shared by all the IconButtons using the same Surface
+_masks = weakref.WeakKeyDictionary()
+
+
+def _icon_mask(icon: Surface) -> Mask:
+    """Return the mask of the opaque pixels of icon, computed once per Surface"""
+    mask = _masks.get(icon)
+    if mask is None:
+        mask = _masks[icon] = from_surface(icon)
+    return mask
+
+
 class IconButton(Button):
-    """A button that is just a Surface (or several if you chose to provide ACTIVE and DISABLED versions)"""
+    """A button that is just a Surface (or several if you chose to provide ACTIVE and DISABLED versions)
+
+    By default only the opaque pixels of the icon can be clicked on, the
+    transparent ones let the clicks through to the widgets below (see the
+    mask_hit parameter for thin icons). The icons must not be modified
+    once the button is created, they are scaled by the scale factor (see
+    `wipyg.resources.scaled_icon`).
+    """
 
     def __init__(
         self,
@@ -109,19 +206,23 @@ class IconButton(Button):
         active_icon: Surface = None,
         disabled_icon=None,
         state: int = Button.INACTIVE,
+        mask_hit: bool = True,
     ) -> None:
         """Create an icon button
 
         Parameters
         ----------
         icon : Surface
-            the normal appearance of the button, clicking anywhere on the Surface will post a Button.CLICKED
+            the normal appearance of the button, clicking on its opaque pixels will post a Button.CLICKED
         active_icon : Surface, optional
             Appearance of the button when clicked on (before MOUSEBUTTONUP fires), by default the same as icon
         disabled_icon : [type], optional
             Appearance of the button if it is in Button.DISABLED state, by default the same as icon
         state : int, optional
             Initial state of the button, by default Button.INACTIVE
+        mask_hit : bool, optional
+            Can only the opaque pixels of the icon be clicked on ? by default True,
+            False to click anywhere in its rect, for icons drawn with thin lines
 
         Raises
         ------
@@ -133,17 +234,40 @@ class IconButton(Button):
             active_icon = icon
         if disabled_icon is None:
             disabled_icon = icon
-        self._icons = [icon, active_icon, disabled_icon]
         if active_icon.get_rect() != icon.get_rect():
             raise ValueError(
                 "Both the icon and active_icon must have the same dimensions"
             )
+        # the icons as given, before scaling
+        self._sources = [icon, active_icon, disabled_icon]
+        self._mask_hit = mask_hit
         self.rect = icon.get_rect()
+        self._load_resources()
         self.image = self._icons[state]
 
+    def _load_resources(self):
+        scale = self.scale
+        self._icons = [scaled_icon(i, scale) for i in self._sources]
+        if self._mask_hit:
+            self._masks = [_icon_mask(i) for i in self._icons]
+        self.rect.size = self._icons[0].get_size()
+
     def _set_state(self, state):
         self.image = self._icons[state]
         super()._set_state(state)
 
     def redraw(self):
         self.image = self._icons[self.state]
+
+    def _hit(self, pos: Tuple[int, int]) -> bool:
+        abs_rect = self.abs_rect
+        if not abs_rect.collidepoint(pos):
+            return False
+        if not self._mask_hit:
+            return True
+        mask = self._masks[self.state]
+        return bool(mask.get_at((pos[0] - abs_rect.x, pos[1] - abs_rect.y)))
+
+    def _surfaces(self) -> list:
+        # the icons belong to whoever created the button, not their converted copies
+        return self._display_surfaces()
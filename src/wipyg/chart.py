@@ -0,0 +1,282 @@
+# -*- coding: utf-8 -*-
+"""Provide the Chart widget drawing series of samples as lines or bars, like sparklines."""
+
+from math import ceil
+from numbers import Number
+
+from wipyg.abstracts import *
+from pygame import Surface, Color
+from pygame.draw import lines
+
+try:
+    import numpy
+except ImportError:  # the samples are binned by a Python loop without NumPy
+    numpy = None
+
+
+def _bin(values, start: int, per: int) -> Tuple[int, list, list]:
+    """Return the minimum and maximum of values in each column of per samples
+
+    Parameters
+    ----------
+    values : sequence[float]
+        The samples, the first one being the sample number start of the series
+    start : int
+    per : int
+        Number of samples in a column, the column of sample i is i // per
+
+    Returns
+    -------
+    (int, list[float], list[float])
+        The column of the first sample, the minimums and maximums of the columns
+    """
+    first = start // per
+    # for a few samples, the conversion to an array costs more than the loop
+    if numpy is not None and len(values) > 64:
+        values = numpy.asarray(values, dtype=float)
+        last = (start + len(values) - 1) // per
+        edges = numpy.arange(first, last + 1) * per - start
+        edges[0] = 0
+        lows = numpy.minimum.reduceat(values, edges)
+        highs = numpy.maximum.reduceat(values, edges)
+        return first, lows.tolist(), highs.tolist()
+
+    lows, highs = [], []
+    column = first
+    for i, value in enumerate(values, start):
+        if i // per != column or not lows:
+            column = i // per
+            lows.append(value)
+            highs.append(value)
+        else:
+            lows[-1] = min(lows[-1], value)
+            highs[-1] = max(highs[-1], value)
+    return first, lows, highs
+
+
+class Chart(Widget):
+    """A chart of the last samples of a series, drawn as a line or as bars
+
+    The samples are binned in columns of one pixel, each column showing the
+    minimum and maximum of its samples, so a long series is drawn as fast as a
+    short one. A column is made of the samples i such that i // samples_per_column
+    is the same, so appending new samples only moves the image and paints the
+    new columns, unless they go out of the range of the vertical axis.
+
+    Methods
+    -------
+    set_samples(samples : sequence[float])
+        Replace all the samples
+    append(samples : float | sequence[float])
+        Add samples at the end of the series
+
+    Attributes
+    ----------
+    samples_per_column : int
+        How many samples are binned in a column of pixels, read only
+    value_range : (float, float)
+        The values at the bottom and at the top of the chart, read only
+    """
+
+    def __init__(
+        self,
+        samples=(),
+        size: Tuple[int, int] = (200, 40),
+        capacity: int = None,
+        bars: bool = False,
+        color=(0, 0, 0),
+        bg_color=(255, 255, 255, 0),
+        vmin: float = None,
+        vmax: float = None,
+    ) -> None:
+        """Create a Chart widget
+
+        Parameters
+        ----------
+        samples : sequence[float], optional
+            The initial samples, a NumPy array or any sequence, by default none
+        size : (int, int), optional
+            Width and height of the chart in pixels of the screen (not multiplied by
+            the scale factor, the columns are bins of samples), by default (200, 40)
+        capacity : int, optional
+            How many of the last samples are shown, by default one per pixel of the width
+        bars : bool, optional
+            Draw bars from the bottom rather than a line, by default False
+        color : color, optional
+            Color of the line or bars, by default black
+        bg_color : color, optional
+            Background color, by default transparent
+        vmin : float, optional
+            The value at the bottom of the chart, by default the minimum of the samples shown
+        vmax : float, optional
+            The value at the top of the chart, by default the maximum of the samples shown
+        """
+        super().__init__()
+        self.rect = Rect((0, 0), size)
+        width = self.rect.width
+        if capacity is None:
+            capacity = width
+        self._per = max(1, ceil(capacity / width))
+        self._bars = bars
+        self._color = color
+        self._bg_color = bg_color
+        self._fixed = (vmin, vmax)
+        self._range = (0.0, 1.0)
+        self.set_samples(samples)
+
+    def _add(self, samples) -> Tuple[int, int]:
+        """Bin the samples in the columns
+
+        Returns
+        -------
+        (int, int)
+            How many columns the image must move to the left, and the first changed column
+        """
+        width = self.rect.width
+        if not len(samples):
+            return 0, width
+        first, lows, highs = _bin(samples, self._total, self._per)
+        self._total += len(samples)
+        shift = first + len(lows) - 1 - self._last
+        if shift > 0:
+            self._last += shift
+            shift = min(shift, width)
+            self._lows = self._lows[shift:] + [None] * shift
+            self._highs = self._highs[shift:] + [None] * shift
+        changed = width
+        for column, low, high in zip(range(first, first + len(lows)), lows, highs):
+            x = column - self._last + width - 1
+            if x < 0:
+                continue
+            if self._lows[x] is not None:
+                low = min(low, self._lows[x])
+                high = max(high, self._highs[x])
+            self._lows[x] = low
+            self._highs[x] = high
+            changed = min(changed, x)
+        return max(shift, 0), changed
+
+    def _auto_range(self) -> Tuple[float, float]:
+        vmin, vmax = self._fixed
+        if vmin is None:
+            vmin = min((v for v in self._lows if v is not None), default=0.0)
+        if vmax is None:
+            vmax = max((v for v in self._highs if v is not None), default=1.0)
+        return vmin, vmax
+
+    def _ys(self, values: list) -> list:
+        """Return the rows of pixels of values"""
+        vmin, vmax = self._range
+        height = self.rect.height - 1
+        if vmax <= vmin:
+            return [height // 2] * len(values)
+        scale = height / (vmax - vmin)
+        if numpy is not None and len(values) > 64:
+            array = numpy.clip(numpy.asarray(values, dtype=float), vmin, vmax)
+            return (height - numpy.rint((array - vmin) * scale)).astype(int).tolist()
+        return [
+            height - round((min(max(v, vmin), vmax) - vmin) * scale) for v in values
+        ]
+
+    def _paint(self, x0: int, x1: int):
+        """Paint the columns x0 to x1 (excluded) on the image"""
+        height = self.rect.height
+        self.image.fill(self._bg_color, Rect(x0, 0, x1 - x0, height))
+        # the previous column is drawn again to join the line to it
+        xs = [x for x in range(max(0, x0 - 1), x1) if self._lows[x] is not None]
+        highs = self._ys([self._highs[x] for x in xs])
+        if self._bars:
+            base = height - 1
+            points = [
+                p for x, y in zip(xs, highs) for p in ((x, base), (x, y), (x, base))
+            ]
+        else:
+            lows = self._ys([self._lows[x] for x in xs])
+            points = [
+                p for x, y0, y1 in zip(xs, lows, highs) for p in ((x, y0), (x, y1))
+            ]
+        if len(points) == 1:
+            points.append(points[0])
+        if points:
+            # a single call draws the bins of all the columns
+            lines(self.image, self._color, False, points)
+
+    def redraw(self):
+        self._range = self._auto_range()
+        self.image = Surface(self.rect.size, SRCALPHA)
+        self._paint(0, self.rect.width)
+
+    def set_samples(self, samples):
+        """Replace all the samples
+
+        Parameters
+        ----------
+        samples : sequence[float]
+            A NumPy array or any sequence of numbers
+        """
+        width = self.rect.width
+        # minimum and maximum of the last columns, None if they have no sample
+        self._lows = [None] * width
+        self._highs = [None] * width
+        # only the samples of the visible columns are binned
+        skipped = max(0, len(samples) - width * self._per)
+        skipped -= skipped % self._per
+        self._total = skipped
+        self._last = skipped // self._per + width - 1
+        self._add(samples[skipped:])
+        self.redraw()
+        self.invalidate()
+
+    def append(self, samples):
+        """Add samples at the end of the series
+
+        Parameters
+        ----------
+        samples : float | sequence[float]
+            One or several new samples
+        """
+        if isinstance(samples, Number):
+            samples = [samples]
+        if not len(samples):
+            return
+        width = self.rect.width
+        shift, x0 = self._add(samples)
+        if self._released:
+            return
+        vmin, vmax = self._range
+        fixed_min, fixed_max = self._fixed
+        # only the changed columns may go out of the range
+        lows = [v for v in self._lows[x0:] if v is not None]
+        highs = [v for v in self._highs[x0:] if v is not None]
+        if (
+            shift >= width
+            or (fixed_min is None and min(lows) < vmin)
+            or (fixed_max is None and max(highs) > vmax)
+        ):
+            self.redraw()
+        else:
+            if shift:
+                self.image.scroll(-shift, 0)
+            self._paint(x0, width)
+            self._image_changed()
+        self.invalidate()
+
+    def _get_samples_per_column(self) -> int:
+        return self._per
+
+    samples_per_column = property(
+        _get_samples_per_column,
+        doc="How many samples are binned in a column of pixels",
+    )
+
+    def _get_value_range(self) -> Tuple[float, float]:
+        return self._range
+
+    value_range = property(
+        _get_value_range, doc="The values at the bottom and at the top of the chart"
+    )
+
+    def _get_opaque(self) -> bool:
+        return Color(self._bg_color).a == 255
+
+    opaque = property(_get_opaque, doc="Is the background color of the Chart opaque ?")
@@ -2,11 +2,11 @@
 """Provides a Frame container, with a grid, and a Window container with decorations."""
 
 from wipyg.abstracts import *
-from pygame.font import Font
-from pygame import Surface, color
-from pygame.draw import *
+from pygame import Surface, Color
+from pygame.draw import line, rect
 
 from wipyg.buttons import IconButton
+from wipyg.skin import Skin
 
 
 class Frame(GridContainer):
@@ -19,7 +19,12 @@ class Frame(GridContainer):
     """
 
     def __init__(
-        self, widgets: list[list[Widget]], bg_color=(255, 255, 255, 0)
+        self,
+        widgets: list[list[Widget]],
+        bg_color=(255, 255, 255, 0),
+        direct: bool = False,
+        column_weights: list = None,
+        line_weights: list = None,
     ) -> None:
         """Create a gridded container that simply display all its children in the minimum space, each centered in its cell
 
@@ -29,6 +34,12 @@ class Frame(GridContainer):
             An initial grid of widgets, don't give it an empty list
         bg_color : color
             The background color of the Frame, by default transparent
+        direct : bool, optional
+            Draw the children directly on the target surface (see `Container`), by default False
+        column_weights : list[int], optional
+            How the extra width is shared between the columns, see `GridContainer`, by default none
+        line_weights : list[int], optional
+            How the extra height is shared between the lines, see `GridContainer`, by default none
         Raises
         ------
         ValueError
@@ -40,39 +51,36 @@ class Frame(GridContainer):
             )
         super().__init__()
         self._bg_color = bg_color
+        self._direct = direct
 
+        # the dimensions are known, the grid is measured once all the widgets are added
         self._grid = widgets
-        self.lines = len(widgets)
-        self.columns = len(widgets[0])
+        self._lines = len(widgets)
+        self._columns = len(widgets[0])
+        for line in widgets:
+            if len(line) < self._columns:
+                line.extend([None] * (self._columns - len(line)))
+        self._column_weights = self._weights(column_weights or [], self._columns)
+        self._line_weights = self._weights(line_weights or [], self._lines)
         for y in range(self.lines):
             for x in range(self.columns):
                 w = self._grid[y][x]
                 if isinstance(w, Sprite):
                     self.add_widget(w)
+        self._grid_changed()
 
         self.rect = self._grid_rect.copy()
+        # the subwidgets are centered in their cells by layout(), their rect stays
+        # relative to the Frame so moving the Frame doesn't require a redraw
+        self.layout()
         self.redraw()
 
     def redraw(self):
-        bg_color = self._bg_color
-        self._refresh_dims()
-        self.rect.size = self._grid_rect.size
-
         self.image = Surface(self.rect.size, SRCALPHA)
-        self.image.fill(bg_color)
+        self.image.fill(self._bg_color)
 
-        for y in range(self.lines):
-            for x in range(self.columns):
-                w = self._grid[y][x]
-                if isinstance(w, Sprite):
-                    # center the subwidgets in the cells
-                    r = w.rect
-                    i = w.image
-                    r.center = self._cells[y][x].center
-                    self.image.blit(i, r)
-                    # place the rectangle of the subwidgets relative to the screen for
-                    # correct event reactions
-                    r.move_ip(self.rect.topleft)
+        if not self._direct:
+            self._compose(self.image)
 
     def _get_bg_color(self):
         return self._bg_color
@@ -80,25 +88,60 @@ class Frame(GridContainer):
     def _set_bg_color(self, bg_color):
         self._bg_color = bg_color
         self.redraw()
+        self.invalidate()
 
     bg_color = property(
         _get_bg_color, _set_bg_color, doc="The background color of the Frame"
     )
 
+    def _get_opaque(self) -> bool:
+        return Color(self._bg_color).a == 255
+
+    opaque = property(
+        _get_opaque, doc="Is the background color of the Frame fully opaque ?"
+    )
+
+
+_icons = None
 
-CROSS = Surface((20, 20), SRCALPHA)
-line(CROSS, (0, 0, 0), (4, 4), (16, 16))
-line(CROSS, (0, 0, 0), (16, 4), (4, 16))
-BAR = Surface((20, 20), SRCALPHA)
-line(BAR, (0, 0, 0), (4, 10), (16, 10))
+
+def _window_icons() -> Tuple[Surface, Surface]:
+    """Return the CROSS and BAR icons of the Window bar, drawn the first time they are needed"""
+    global _icons
+    if _icons is None:
+        cross = Surface((20, 20), SRCALPHA)
+        line(cross, (0, 0, 0), (4, 4), (16, 16))
+        line(cross, (0, 0, 0), (16, 4), (4, 16))
+        bar = Surface((20, 20), SRCALPHA)
+        line(bar, (0, 0, 0), (4, 10), (16, 10))
+        _icons = cross, bar
+    return _icons
+
+
+def __getattr__(name: str):
+    # CROSS and BAR aren't created when the module is imported
+    if name == "CROSS":
+        return _window_icons()[0]
+    if name == "BAR":
+        return _window_icons()[1]
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
 class Window(Container):
     """A container with a window decoration
 
-    The bar allows to close or minimize (roll up) or move the window as usual"""
+    The bar allows to close or minimize (roll up) or move the window as usual,
+    its height of 20 pixels is multiplied by the scale factor."""
+
+    BAR_HEIGHT = 20
 
-    def __init__(self, window_content: Widget, bar_color=(110, 110, 110)) -> None:
+    def __init__(
+        self,
+        window_content: Widget,
+        bar_color=(110, 110, 110),
+        direct: bool = False,
+        bar_skin: Skin = None,
+    ) -> None:
         """Create a window with a bar with the usual controls to close or minimize the window
 
         Parameters
@@ -107,11 +150,19 @@ class Window(Container):
             The content of the window, usually a Frame but may be a single Widget
         bar_color : color, optional
             The color of the window bar, by default (110, 110, 110)
+        direct : bool, optional
+            Draw the children directly on the target surface (see `Container`), by default False
+        bar_skin : Skin, optional
+            Draw the bar from an image rather than with bar_color, by default None
         """
         super().__init__()
         self._bar_color = bar_color
-        self._close = IconButton(CROSS)
-        self._minimize = IconButton(BAR)
+        self._bar_skin = bar_skin
+        self._direct = direct
+        cross, bar = _window_icons()
+        # the lines of the icons are too thin to be clicked on precisely
+        self._close = IconButton(cross, mask_hit=False)
+        self._minimize = IconButton(bar, mask_hit=False)
         self._content = window_content
         self.add_widget(self._close)
         self.add_widget(self._minimize)
@@ -126,36 +177,67 @@ class Window(Container):
         self.add_reaction(MOUSEBUTTONUP, self._ungrabbing)
         self._grabbed = False
 
+        self._load_resources()
+        self.layout()
         self.redraw()
 
-    def redraw(self):
-        if self._minimized:
-            self.rect.height = 20
-        else:
-            self._content.rect.topleft = self.rect.move(0, 20).topleft
-            self._content.redraw()
-            content_img = self._content.image
-            content_rect = content_img.get_rect(y=20)
-
-            self.rect.size = content_rect.size
-            self.rect.height += 20
+    def _load_resources(self):
+        self._bar_height = self._px(Window.BAR_HEIGHT)
 
-        self.image = Surface(self.rect.size, SRCALPHA)
+    def measure(self) -> Tuple[int, int]:
+        width, height = self._content.measure()
+        if self._minimized:
+            return width, self._bar_height
+        return width, height + self._bar_height
 
+    def layout(self):
+        width, height = self.measure()
+        bar_height = self._bar_height
         if not self._minimized:
-            self.image.blit(content_img, content_rect)
+            self._content.arrange(Rect(0, bar_height, width, height - bar_height))
+        self.rect.size = width, height
+        self._close.rect.topright = (width, 0)
+        self._minimize.rect.topright = self._close.rect.topleft
+        self._layout_dirty = False
 
-        rect(self.image, self._bar_color, Rect(0, 0, self.rect.width, 20))
-
-        self._close.rect.topright = self.rect.topright
-        self._minimize.rect.topright = self.rect.move(-20, 0).topright
+    def redraw(self):
         self._close.redraw()
         self._minimize.redraw()
-        self.image.blit(self._close.image, Rect(self.rect.width - 20, 0, 20, 20))
-        self.image.blit(self._minimize.image, Rect(self.rect.width - 40, 0, 20, 20))
+
+        if self._direct:
+            # only the bar, the children are drawn by draw()
+            self.image = Surface((self.rect.width, self._bar_height), SRCALPHA)
+        else:
+            self.image = Surface(self.rect.size, SRCALPHA)
+        bar = Rect(0, 0, self.rect.width, self._bar_height)
+        if self._bar_skin is None:
+            rect(self.image, self._bar_color, bar)
+        else:
+            self.image.blit(
+                self._bar_skin.background(bar.size, self._applied_scale), bar
+            )
+
+        if not self._direct:
+            self._compose(self.image)
+
+    def _drawn_children(self) -> list:
+        if self._minimized:
+            return [self._close, self._minimize]
+        return [self._content, self._close, self._minimize]
+
+    def reset(self):
+        super().reset()
+        self._ungrabbing(self, None)
+        if self._minimized:
+            self._minimized = False
+            self._content.enable()
+            self.invalidate_layout()
+            self.layout()
+            self.redraw()
 
     def _close_window(self, source, e):
         if e.button == self._close:
+            self.invalidate()
             self.kill()
 
     def _min_window(self, source, e):
@@ -165,20 +247,233 @@ class Window(Container):
                 self._content.disable()
             else:
                 self._content.enable()
+            self.invalidate_layout()
+            self.layout()
             self.redraw()
 
     def _grabbing(self, source, e):
-        bar = self.rect.copy()
-        bar.height = 20
-        bar.width -= 40
+        bar = self.abs_rect.copy()
+        bar.height = self._bar_height
+        bar.width -= self._close.rect.width + self._minimize.rect.width
         if bar.collidepoint(e.pos):
             self._grabbed = self.add_reaction(MOUSEMOTION, self._move_window)
+            # the motion events come directly to the Window until the button is released
+            self.capture_pointer()
 
     def _ungrabbing(self, source, e):
         if self._grabbed:
             self.del_reaction(self._grabbed)
             self._grabbed = False
+            self.release_pointer()
 
     def _move_window(self, source, e):
+        # the children rects are relative to the window, nothing to redraw
         self.rect.move_ip(e.rel)
+        self.invalidate()
+
+    def _get_opaque(self) -> bool:
+        if self._bar_skin is not None:
+            if not self._bar_skin.opaque:
+                return False
+        elif Color(self._bar_color).a != 255:
+            return False
+        return self._minimized or self._content.opaque
+
+    opaque = property(
+        _get_opaque, doc="Are both the bar and the content of the Window opaque ?"
+    )
+
+
+def _subtract(r: Rect, hole: Rect) -> list:
+    """Return the rectangles covering the part of r outside of hole"""
+    if not r.colliderect(hole):
+        return [r]
+    c = r.clip(hole)
+    pieces = [
+        Rect(r.left, r.top, r.width, c.top - r.top),
+        Rect(r.left, c.bottom, r.width, r.bottom - c.bottom),
+        Rect(r.left, c.top, c.left - r.left, c.height),
+        Rect(c.right, c.top, r.right - c.right, c.height),
+    ]
+    return [p for p in pieces if p.width > 0 and p.height > 0]
+
+
+def _covered(r: Rect, covers: list) -> bool:
+    """Is r entirely covered by the union of the covers rectangles ?"""
+    remaining = [r]
+    for hole in covers:
+        remaining = [p for q in remaining for p in _subtract(q, hole)]
+        if not remaining:
+            return True
+    return False
+
+
+class WindowManager(Container):
+    """A container stacking overlapping Windows
+
+    The Windows are kept in a z-order, the last one to be clicked on being raised
+    above the others. Positional events (mouse buttons and motion) only go to the
+    topmost Window under the pointer (or to the one where the mouse button was
+    pressed, until it is released, unless a widget captures the pointer, see
+    `Widget.capture_pointer`). Pressing a mouse button in a Window takes the
+    keyboard focus from the widgets of the other ones, and a button released
+    outside of all the Windows goes to every Window, so their widgets are
+    deselected. Windows
+    entirely hidden behind opaque ones are neither updated nor drawn.
+
+    Methods
+    -------
+    raise_window(w : Widget)
+        Put w above all the other Windows
+
+    Attributes
+    ----------
+    windows : list[Widget]
+        The Windows still alive, from the bottom to the top of the stack, read only
+    """
+
+    POSITIONAL = (MOUSEBUTTONDOWN, MOUSEBUTTONUP, MOUSEMOTION)
+
+    def __init__(
+        self, size: Tuple[int, int], windows: list = (), direct: bool = False
+    ) -> None:
+        """Create a window manager covering an area of the given size
+
+        Parameters
+        ----------
+        size : (int, int)
+            Size of the area where the Windows live, usually the size of the screen
+        windows : list[Widget], optional
+            Initial Windows, from the bottom to the top of the stack, by default none
+        direct : bool, optional
+            Draw the Windows directly on the target surface (see `Container`), by default False
+        """
+        super().__init__()
+        self._direct = direct
+        # Window.kill() removes a closed Window from this group, so we can forget it
+        self._members = Group()
+        self._pressed = None
+        self.rect = Rect((0, 0), size)
+        for w in windows:
+            self.add_widget(w)
         self.redraw()
+
+    def add_widget(self, w: Widget):
+        super().add_widget(w)
+        self._members.add(w)
+
+    def del_widget(self, w: Widget):
+        super().del_widget(w)
+        self._members.remove(w)
+
+    def raise_window(self, w: Widget):
+        """Put w above all the other Windows
+
+        Parameters
+        ----------
+        w : Widget
+        """
+        self._widgets.remove(w)
+        self._widgets.append(w)
+        self.invalidate()
+
+    def _prune(self):
+        """Forget the Windows that were killed since the last call"""
+        if len(self._widgets) != len(self._members):
+            for w in self._widgets:
+                if not self._members.has(w):
+                    w.container = None
+            self._widgets = [w for w in self._widgets if self._members.has(w)]
+            self.invalidate()
+        if self._pressed is not None and not self._members.has(self._pressed):
+            self._pressed = None
+
+    def _window_at(self, pos):
+        """Return the topmost Window under pos, or None"""
+        for w in reversed(self._widgets):
+            if w.abs_rect.collidepoint(pos):
+                return w
+        return None
+
+    def _blur_outside(self, window: Widget):
+        """Take the focus from the widget of another Window than window, if one has it"""
+        manager = self.focus_manager
+        focused = manager.focused
+        w = focused
+        while w is not None and w is not window:
+            w = w.container
+        if focused is not None and w is None:
+            # like a selected Entry, the other Windows never see this click
+            manager.blur(focused)
+
+    def _dispatch(self, event: Event) -> bool:
+        self._prune()
+        if event.type not in WindowManager.POSITIONAL:
+            return super()._dispatch(event)
+
+        if event.type == MOUSEBUTTONDOWN:
+            target = self._window_at(event.pos)
+            if target is not None:
+                self.raise_window(target)
+            self._pressed = target
+            self._blur_outside(target)
+        elif self._pressed is not None:
+            # the Window where the button was pressed keeps the pointer until release
+            target = self._pressed
+            if event.type == MOUSEBUTTONUP:
+                self._pressed = None
+        else:
+            target = self._window_at(event.pos)
+            if target is None and event.type == MOUSEBUTTONUP:
+                # a click outside of all the Windows deselects their widgets
+                return super()._dispatch(event)
+
+        handled = bool(target is not None and target.react(event))
+        if self._pressed is not None and self.focus_manager.captured is not None:
+            # an explicit capture replaces the implicit one until the button is released
+            self._pressed = None
+        return handled
+
+    def _visible_windows(self) -> list:
+        """Return the Windows not entirely hidden by opaque ones, from bottom to top"""
+        visible = []
+        covers = []
+        for w in reversed(self._widgets):
+            if not _covered(w.rect, covers):
+                visible.append(w)
+            if w.opaque:
+                covers.append(w.rect)
+        visible.reverse()
+        return visible
+
+    def update(self, *args, **kwargs) -> None:
+        self._apply_bindings()
+        self._prune()
+        view = self._local_view()
+        for w in self._visible_windows():
+            if view.colliderect(w.rect):
+                if w._released:
+                    w._restore()
+                w.update()
+        self.redraw()
+        self._dirty = False
+
+    def redraw(self):
+        if self._direct:
+            # no decoration at all, the Windows are drawn by draw()
+            self.image = Surface((0, 0), SRCALPHA)
+        else:
+            self.image = Surface(self.rect.size, SRCALPHA)
+            self._compose(self.image)
+
+    def _drawn_children(self) -> list:
+        return self._visible_windows()
+
+    def _get_windows(self) -> list:
+        self._prune()
+        return list(self._widgets)
+
+    windows = property(
+        _get_windows,
+        doc="The Windows still alive, from the bottom to the top of the stack",
+    )
@@ -0,0 +1,235 @@
+# -*- coding: utf-8 -*-
+"""Provide a persistent cache of the rendered images of the widgets, to start big GUIs faster."""
+
+import hashlib
+import mmap
+import os
+import struct
+
+import pygame
+from pygame.image import frombuffer, tobytes
+from pygame.surface import Surface
+from wipyg.resources import get_render_cache, set_render_cache
+
+_MAGIC = b"WIPYGRC1"
+# content hash, width, height, number of bytes of the pixels
+_RECORD = struct.Struct("<20sIII")
+
+
+def font_stamp(font) -> tuple:
+    """Return what identifies the content of a font, None if it can't be known
+
+    Parameters
+    ----------
+    font : file | filename
+        The source of the font, None for the default font of Pygame
+
+    Returns
+    -------
+    tuple
+        The path, modification time and size of the font file
+    """
+    if font is None:
+        # the default font comes with pygame, whose version is in every key
+        return ("default",)
+    if not isinstance(font, (str, bytes, os.PathLike)):
+        return None
+    try:
+        stat = os.stat(font)
+    except OSError:
+        return None
+    return (os.fspath(font), stat.st_mtime_ns, stat.st_size)
+
+
+class RenderCache:
+    """A cache of rendered images stored in a file and read through a memory map
+
+    Rendering the texts of a big GUI with the fonts can take seconds on slow
+    hardware, although the images are the same at each run. Once a cache is
+    installed with `install`, the `Label` and the `PlainButton` look their
+    image up in the cache before drawing it, and store it after. At the next
+    run, the images are copied from the file instead of being drawn. The
+    containers aren't cached, composing their children costs less than
+    copying their image from the file.
+
+    The images are found by a hash of all they depend on: the type of the
+    widget, its text, colors, state and scale, the path, modification time and
+    size of the font file, and the version of Pygame. A change of any of them
+    makes another key, so the cache never gives an outdated image. The
+    outdated images stay in the file until `clear` is called. Widgets drawn
+    with a file object as font or with a `Skin` aren't cached.
+
+    The file is only used by one process at a time.
+
+    Methods
+    -------
+    get(parts : tuple) -> Surface
+        The image stored for this key, None if it isn't stored
+    put(parts : tuple, image : Surface)
+        Store the image for this key
+    font_stamp(font) -> tuple
+        What identifies the content of a font, checked once per font
+    install()
+        Make it the cache used by the widgets
+    clear()
+        Forget all the images
+    close()
+        Close the file, and uninstall the cache if it is installed
+
+    Attributes
+    ----------
+    hits : int
+        Number of images found in the cache
+    misses : int
+        Number of images looked up but not found
+    """
+
+    def __init__(self, path, max_bytes: int = 64 * 2**20) -> None:
+        """Open a cache file, created if it doesn't exist
+
+        Parameters
+        ----------
+        path : filename
+        max_bytes : int, optional
+            The file doesn't grow beyond this size, by default 64 MiB
+        """
+        self._path = path
+        self._max_bytes = max_bytes
+        self._file = open(path, "a+b")
+        self._map = None
+        self._index = {}
+        self._fonts = {}
+        self._version = pygame.version.ver.encode()
+        self.hits = 0
+        self.misses = 0
+        self._load_index()
+
+    def _load_index(self):
+        """Read the headers of the records, dropping an incomplete one at the end"""
+        self._file.seek(0, os.SEEK_END)
+        size = self._file.tell()
+        if size < len(_MAGIC):
+            self._reset()
+            return
+        self._remap()
+        if self._map[: len(_MAGIC)] != _MAGIC:
+            # written by another version of this module
+            self._reset()
+            return
+        offset = len(_MAGIC)
+        while offset + _RECORD.size <= size:
+            digest, width, height, length = _RECORD.unpack_from(self._map, offset)
+            start = offset + _RECORD.size
+            if start + length > size:
+                break
+            self._index[digest] = (start, width, height, length)
+            offset = start + length
+        if offset != size:
+            # the end of a record wasn't written, it is overwritten by the next one
+            self._close_map()
+            self._file.truncate(offset)
+
+    def _reset(self):
+        self._close_map()
+        self._file.truncate(0)
+        self._file.write(_MAGIC)
+        self._file.flush()
+        self._index = {}
+
+    def _remap(self):
+        self._close_map()
+        self._file.flush()
+        self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+
+    def _close_map(self):
+        if self._map is not None:
+            self._map.close()
+            self._map = None
+
+    def font_stamp(self, font) -> tuple:
+        """Return what identifies the content of a font, see `font_stamp`
+
+        The file is only checked the first time, it must not change while the GUI runs.
+        """
+        if not isinstance(font, (str, bytes, os.PathLike)) and font is not None:
+            return None
+        stamp = self._fonts.get(font)
+        if stamp is None:
+            stamp = self._fonts[font] = font_stamp(font)
+        return stamp
+
+    def _digest(self, parts: tuple) -> bytes:
+        return hashlib.sha1(self._version + repr(parts).encode()).digest()
+
+    def get(self, parts: tuple) -> Surface:
+        """Return the image stored for this key, None if it isn't stored
+
+        Parameters
+        ----------
+        parts : tuple
+            Everything the image depends on, made of numbers, strings, tuples and colors
+
+        Returns
+        -------
+        Surface
+            A new Surface with per pixel alpha, or None
+        """
+        entry = self._index.get(self._digest(parts))
+        if entry is None:
+            self.misses += 1
+            return None
+        start, width, height, length = entry
+        if self._map is None or start + length > len(self._map):
+            # stored since the file was mapped
+            self._remap()
+        self.hits += 1
+        view = memoryview(self._map)[start : start + length]
+        try:
+            # a single copy, from the mapped file to the new Surface
+            return frombuffer(view, (width, height), "BGRA").copy()
+        finally:
+            view.release()
+
+    def put(self, parts: tuple, image: Surface):
+        """Store the image for this key, if it isn't stored and the file isn't full
+
+        Parameters
+        ----------
+        parts : tuple
+            Everything the image depends on, as for `get`
+        image : Surface
+        """
+        digest = self._digest(parts)
+        if digest in self._index:
+            return
+        pixels = tobytes(image, "BGRA")
+        self._file.seek(0, os.SEEK_END)
+        offset = self._file.tell()
+        if offset + _RECORD.size + len(pixels) > self._max_bytes:
+            return
+        width, height = image.get_size()
+        self._file.write(_RECORD.pack(digest, width, height, len(pixels)))
+        self._file.write(pixels)
+        self._index[digest] = (offset + _RECORD.size, width, height, len(pixels))
+
+    def install(self):
+        """Make it the cache used by the widgets, replacing any other one"""
+        set_render_cache(self)
+
+    def clear(self):
+        """Forget all the images"""
+        self._reset()
+
+    def close(self):
+        """Close the file, and uninstall the cache if it is installed"""
+        if get_render_cache() is self:
+            set_render_cache(None)
+        self._close_map()
+        self._file.close()
+
+    def __enter__(self) -> "RenderCache":
+        self.install()
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
@@ -2,10 +2,11 @@
 """Provide the text Entry widget type."""
 
 from wipyg.abstracts import *
-from pygame.font import Font
 from pygame import Surface
-from pygame.draw import *
+from pygame.draw import rect
 from pygame.time import get_ticks
+from wipyg.resources import get_font
+from wipyg.skin import _by_state
 import unicodedata
 
 
@@ -27,7 +28,7 @@ class Entry(Widget):
     Custom event
     -------------
         Entry.SUBMIT : launched if the user press K_RETURN or K_KP_ENTER while the Entry is selected
-        contains a "value" attribute of type str and the "entry" it comes from
+        contains a "value" attribute of type str and the "entry" it comes from, see `Widget.emit`
     """
 
     # Class constants
@@ -36,6 +37,8 @@ class Entry(Widget):
     DESELECTED = 1
     DISABLED = 2
 
+    focusable = True
+
     def __init__(
         self,
         value: str = "",
@@ -43,6 +46,7 @@ class Entry(Widget):
         size: int = 30,
         length: int = 40,
         state: int = 1,
+        skin=None,
     ):
         """
         Parameters
@@ -52,11 +56,14 @@ class Entry(Widget):
         font : file | str (filename)
             Font to use for the Entry
         size : int
-            Font size
+            Font size, multiplied by the scale factor
         length : int
             How many character long can the Entry take
         state : int
             State of the Entry, one of (Entry.SELECTED, Entry.DESELECTED, Entry.DISABLED), DESELECTED by default
+        skin : Skin | list[Skin]
+            The background and border, or one for each state (indexed by the states),
+            None by default to draw a rounded rectangle
 
         Raises
         ------
@@ -67,17 +74,24 @@ class Entry(Widget):
             raise ValueError("value can't be longer than the length of the Entry")
         super().__init__()
         self._length = length
-        self._font = Font(font, size)
+        self._skins = _by_state(skin)
+        self._font_source = font
+        self._size = size
         self._value = list(value)
         self._cursor = len(value)
         self._state = state
         self._first_blink = get_ticks()
         self.rect = Rect(0, 0, 0, 0)
+        self._load_resources()
         self.redraw()
 
         self.add_reaction(KEYDOWN, self._press_key)
         self.add_reaction(MOUSEBUTTONUP, self._select)
 
+    def _load_resources(self):
+        self._font_size = self._px(self._size)
+        self._font = get_font(self._font_source, self._font_size)
+
     def redraw(self):
         if self._state == Entry.DISABLED:
             bg_color = (200, 200, 200)
@@ -96,17 +110,24 @@ class Entry(Widget):
         value_rect = value_img.get_rect(centery=self.rect.centery, left=padding)
 
         self.image = Surface(self.rect.size, SRCALPHA)
-        self.image.fill((255, 255, 255, 0))
-        border = self.rect.inflate(-2, -2)
-        border.center = self.rect.center
-        rect(self.image, bg_color, border, border_radius=4)
-        rect(self.image, (0, 0, 0), border, width=1, border_radius=4)
+        skin = self._skins[self._state]
+        if skin is None:
+            self.image.fill((255, 255, 255, 0))
+            border = self.rect.inflate(-self._px(2), -self._px(2))
+            border.center = self.rect.center
+            radius = self._px(4)
+            rect(self.image, bg_color, border, border_radius=radius)
+            rect(self.image, (0, 0, 0), border, width=self._px(1), border_radius=radius)
+        else:
+            self.image.blit(
+                skin.background(self.rect.size, self._applied_scale), (0, 0)
+            )
 
         if self._state == Entry.SELECTED:
             now = get_ticks()
             if ((now - self._first_blink) // 500) % 2:
                 xcursor = padding + self._font.size(self.value[: self._cursor])[0]
-                cursor_rect = Rect(xcursor, padding, 2, padding)
+                cursor_rect = Rect(xcursor, padding, self._px(2), padding)
                 rect(self.image, (0, 0, 0), cursor_rect)
 
         self.image.blit(value_img, value_rect)
@@ -115,53 +136,84 @@ class Entry(Widget):
         self.rect.topleft = pos
 
     def update(self, *args, **kwargs) -> None:
+        super().update(*args, **kwargs)
         self.redraw()
 
+    def next_timer(self) -> int:
+        if self._state != Entry.SELECTED:
+            return None
+        # the cursor blinks every 500 ms
+        now = get_ticks()
+        return now + 500 - (now - self._first_blink) % 500
+
+    def _wants_focus(self) -> bool:
+        return self._state == Entry.SELECTED
+
+    def _on_focus(self):
+        if self._state != Entry.SELECTED:
+            self.state = Entry.SELECTED
+
+    def _on_blur(self):
+        if self._state == Entry.SELECTED:
+            self.state = Entry.DESELECTED
+
     def _press_key(self, _, e):
         letter = e.unicode
         if self._state == Entry.SELECTED:
-            if e.key == K_LEFT and self._cursor > 0:
-                self._cursor -= 1
-            elif e.key == K_RIGHT and self._cursor < len(self._value):
-                self._cursor += 1
-            elif e.key == K_BACKSPACE and self._cursor > 0:
-                self._cursor -= 1
-                del self._value[self._cursor]
-            elif e.key == K_DELETE and self._cursor < len(self._value):
-                del self._value[self._cursor]
+            self.invalidate()
+            if e.key == K_LEFT:
+                if self._cursor > 0:
+                    self._cursor -= 1
+            elif e.key == K_RIGHT:
+                if self._cursor < len(self._value):
+                    self._cursor += 1
+            elif e.key == K_BACKSPACE:
+                if self._cursor > 0:
+                    self._cursor -= 1
+                    del self._value[self._cursor]
+            elif e.key == K_DELETE:
+                if self._cursor < len(self._value):
+                    del self._value[self._cursor]
             elif e.key == K_END:
                 self._cursor = len(self._value)
             elif e.key == K_HOME:
                 self._cursor = 0
             elif e.key == K_KP_ENTER or e.key == K_RETURN:
                 self.state = Entry.DESELECTED
-                post(Event(Entry.SUBMIT, {"value": self.value, "entry": self}))
+                self.emit(Event(Entry.SUBMIT, {"value": self.value, "entry": self}))
             elif (
                 letter != ""
                 # don't react to Control characters
                 and not unicodedata.category(letter).startswith("C")
-                and len(self._value) < self._length
             ):
-                self._value.insert(self._cursor, letter)
-                self._cursor += 1
+                if len(self._value) < self._length:
+                    self._value.insert(self._cursor, letter)
+                    self._cursor += 1
+            else:
+                # the keys that don't edit the text can be shortcuts of the GUI
+                return False
+            return True
 
     def _select(self, _, e):
         # move the cursor as close as possible to the click (if it is in the Entry)
-        if self.rect.collidepoint(e.pos):
+        abs_rect = self.abs_rect
+        if abs_rect.collidepoint(e.pos):
             padding = self._font.get_height()
             xletters = [
-                self.rect.left + padding + self._font.size(self.value[:j])[0]
+                abs_rect.left + padding + self._font.size(self.value[:j])[0]
                 for j in range(len(self._value) + 1)
             ]
             closest = min(
                 range(len(self._value) + 1), key=lambda i: abs(e.pos[0] - xletters[i])
             )
-            self._cursor = closest
+            if closest != self._cursor:
+                self._cursor = closest
+                self.invalidate()
 
         # toggle SELECTED and DESELECTED state depending on where the user clicked
-        if self._state == Entry.DESELECTED and self.rect.collidepoint(e.pos):
+        if self._state == Entry.DESELECTED and abs_rect.collidepoint(e.pos):
             self.state = Entry.SELECTED
-        elif self._state == Entry.SELECTED and not self.rect.collidepoint(e.pos):
+        elif self._state == Entry.SELECTED and not abs_rect.collidepoint(e.pos):
             self.state = Entry.DESELECTED
 
     ## Properties
@@ -176,9 +228,14 @@ class Entry(Widget):
             self._cursor = len(self._value)
         else:
             self._cursor = min(self._cursor, len(self._value))
+        self.invalidate()
 
     value = property(_get_value, _set_value, doc="Value of the entry, as a string.")
 
+    def reset(self):
+        if self._state == Entry.SELECTED:
+            self.state = Entry.DESELECTED
+
     def _get_state(self) -> int:
         return self._state
 
@@ -191,6 +248,14 @@ class Entry(Widget):
             self.disable()
         else:
             self.enable()
+        # only one Entry of a tree can be selected, the FocusManager deselects the other
+        manager = self.focus_manager
+        if manager is not None:
+            if state == Entry.SELECTED:
+                manager.focus(self)
+            else:
+                manager.blur(self)
+        self.invalidate()
 
     state = property(
         _get_state,
@@ -204,6 +269,7 @@ class Entry(Widget):
     def _set_cursor(self, cursor: int):
         if 0 <= cursor <= len(self._value):
             self._cursor = cursor
+            self.invalidate()
         else:
             raise ValueError("value can't be longer than the length of the Entry")
 
@@ -0,0 +1,242 @@
+# -*- coding: utf-8 -*-
+"""Provide the FocusManager routing the keyboard and captured pointer events of a tree of widgets."""
+
+from pygame.constants import (
+    KEYDOWN,
+    KEYUP,
+    TEXTINPUT,
+    K_TAB,
+    KMOD_SHIFT,
+    MOUSEMOTION,
+    MOUSEBUTTONUP,
+)
+
+
+class FocusManager:
+    """Track the single widget of a tree that has the keyboard focus
+
+    It is owned by the top-level container of the tree (see `Widget.focus_manager`)
+    which gives the keyboard events directly to the focused widget, then to its
+    containers until one stops the propagation, instead of sending them to
+    every widget. An event that none of them handled (by stopping its
+    propagation) is then sent to the rest of the tree, so the shortcuts of the
+    GUI still work while a widget has the focus. TAB and shift+TAB move the
+    focus between the focusable widgets, in the order of the grids.
+
+    It also tracks the widget capturing the pointer (during a drag for example),
+    which gets all the MOUSEMOTION and MOUSEBUTTONUP events directly until it
+    releases the pointer or the mouse button is released.
+
+    Methods
+    -------
+    focus(w : Widget)
+        Give the focus to w, taking it from the previous focused widget
+    blur(w : Widget)
+        Take the focus from w if it has it
+    focus_next(reverse : bool) -> bool
+        Give the focus to the next (or previous) focusable widget
+    route(e : Event) -> bool
+        Send a keyboard event to the focused widget and its containers
+    capture_pointer(w : Widget)
+        Send the pointer events to w only
+    release_pointer(w : Widget)
+        Stop sending the pointer events to w only
+    route_pointer(e : Event) -> bool
+        Send a pointer event to the widget capturing the pointer
+
+    Attributes
+    ----------
+    focused : Widget
+        The widget with the focus, or None, read only
+    captured : Widget
+        The widget capturing the pointer, or None, read only
+    """
+
+    EVENTS = (KEYDOWN, KEYUP, TEXTINPUT)
+    POINTER = (MOUSEMOTION, MOUSEBUTTONUP)
+
+    def __init__(self, root) -> None:
+        """
+        Parameters
+        ----------
+        root : Container
+            The top-level container of the tree
+        """
+        self._root = root
+        self._focused = None
+        self._captured = None
+
+    def _get_focused(self):
+        return self._focused
+
+    focused = property(_get_focused, doc="The widget with the focus, or None")
+
+    def _get_captured(self):
+        return self._captured
+
+    captured = property(_get_captured, doc="The widget capturing the pointer, or None")
+
+    def focus(self, w):
+        """Give the focus to w, taking it from the previous focused widget
+
+        Parameters
+        ----------
+        w : Widget
+        """
+        previous = self._focused
+        if w is previous:
+            return
+        self._focused = w
+        if previous is not None:
+            previous._on_blur()
+        if w is not None:
+            w._on_focus()
+
+    def blur(self, w):
+        """Take the focus from w if it has it
+
+        Parameters
+        ----------
+        w : Widget
+        """
+        if self._focused is w:
+            self._focused = None
+            w._on_blur()
+
+    def _in_tree(self, w) -> bool:
+        while w.container is not None:
+            w = w.container
+        return w is self._root
+
+    def _focus_order(self) -> list:
+        """List the focusable widgets, line by line in each grid"""
+        order = []
+        todo = [self._root]
+        while todo:
+            w = todo.pop()
+            if not getattr(w, "_enabled", False):
+                continue
+            if w.focusable:
+                order.append(w)
+            if hasattr(w, "_grid"):
+                children = [c for line in w._grid for c in line if c is not None]
+            else:
+                children = getattr(w, "_widgets", [])
+            todo.extend(reversed(children))
+        return order
+
+    def focus_next(self, reverse: bool = False) -> bool:
+        """Give the focus to the next focusable widget
+
+        Parameters
+        ----------
+        reverse : bool, optional
+            Go to the previous one instead, by default False
+
+        Returns
+        -------
+        bool
+            False if there is no focusable widget in the tree
+        """
+        order = self._focus_order()
+        if not order:
+            return False
+        if reverse:
+            order.reverse()
+        if self._focused in order:
+            i = (order.index(self._focused) + 1) % len(order)
+        else:
+            i = 0
+        self.focus(order[i])
+        return True
+
+    def route(self, event) -> bool:
+        """Send a keyboard event to the focused widget, then to its containers, then to the others
+
+        Parameters
+        ----------
+        event : Event
+            A KEYDOWN, KEYUP or TEXTINPUT event
+
+        Returns
+        -------
+        bool
+            Was the event handled ? If not it must be sent to the whole tree
+        """
+        if event.type == KEYDOWN and event.key == K_TAB:
+            if self.focus_next(bool(event.mod & KMOD_SHIFT)):
+                return True
+
+        w = self._focused
+        if w is None:
+            return False
+        if not w._enabled or not self._in_tree(w):
+            self.blur(w)
+            return False
+
+        chain = [w]
+        stop = w.react(event)
+        w = w.container
+        while w is not None and not stop:
+            # only the reactions of the container itself, not its other children
+            chain.append(w)
+            stop = w._react_self(event)
+            w = w.container
+        if not stop:
+            # the other widgets get it as if nothing had the focus, the focused
+            # widget and its containers already reacted to it
+            for w in chain:
+                w._muted = True
+            try:
+                self._root._dispatch(event)
+            finally:
+                for w in chain:
+                    w._muted = False
+        return True
+
+    def capture_pointer(self, w):
+        """Send the MOUSEMOTION and MOUSEBUTTONUP events to w only
+
+        Parameters
+        ----------
+        w : Widget
+        """
+        self._captured = w
+
+    def release_pointer(self, w):
+        """Stop sending the pointer events to w only, if it captured the pointer
+
+        Parameters
+        ----------
+        w : Widget
+        """
+        if self._captured is w:
+            self._captured = None
+
+    def route_pointer(self, event) -> bool:
+        """Send a pointer event to the widget capturing the pointer
+
+        Only the reactions of the widget itself are called, not the ones of its
+        children, and the pointer is released after a MOUSEBUTTONUP.
+
+        Parameters
+        ----------
+        event : Event
+            A MOUSEMOTION or MOUSEBUTTONUP event
+
+        Returns
+        -------
+        bool
+            Was the event handled ? If not it must be sent to the whole tree
+        """
+        w = self._captured
+        if w is None:
+            return False
+        if not self._in_tree(w):
+            self._captured = None
+            return False
+
+        w._react_self(event)
+        if event.type == MOUSEBUTTONUP:
+            self.release_pointer(w)
+        return True
@@ -2,13 +2,18 @@
 """Provide the Label widget type."""
 
 from wipyg.abstracts import *
-from pygame.font import Font
-from pygame import Surface
-from pygame.draw import *
+from pygame import Surface, Color
+from wipyg.resources import get_font
 
 
 class Label(Widget):
-    """A simple label Widget to show some text"""  # TODO #1 add newline support
+    """A simple label Widget to show some text
+
+    Attributes
+    ----------
+    text : str
+        The text displayed
+    """  # TODO #1 add newline support
 
     def __init__(
         self,
@@ -27,24 +32,49 @@ class Label(Widget):
         font : file | filename, optional
             Font to use, see `pygame.font`, by default None
         size : int, optional
-            Font size in pixel, by default 30
+            Font size in pixel (multiplied by the scale factor), by default 30
         color : color, optional
             color of the text, by default black
         bg_color : color, optional
             background color, by default transparent
         """
         super().__init__()
-        self._font = Font(font, size)
+        self._font_source = font
+        self._size = size
         self._text = text
         self._text_color = color
         self._bg_color = bg_color
         self.rect = Rect(0, 0, 0, 0)
+        self._load_resources()
         self.redraw()
 
+    def _load_resources(self):
+        self._font_size = self._px(self._size)
+        self._font = get_font(self._font_source, self._font_size)
+
+    def _render_key(self, cache) -> tuple:
+        stamp = cache.font_stamp(self._font_source)
+        if stamp is None:
+            return None
+        return (
+            type(self).__qualname__,
+            self._text,
+            stamp,
+            self._font_size,
+            self._text_color,
+            self._bg_color,
+        )
+
     def redraw(self):
         bg_color = self._bg_color
 
         pos = self.rect.topleft
+        image, key = self._cached_render()
+        if image is not None:
+            self._text_img = None
+            self.image = image
+            self.rect = Rect(pos, image.get_size())
+            return
         self._text_img = self._font.render(self._text, True, self._text_color)
 
         self._text_rect = self._text_img.get_rect()
@@ -56,6 +86,30 @@ class Label(Widget):
         self.image = Surface(self.rect.size, SRCALPHA)
         self.image.fill(bg_color)
         self.image.blit(self._text_img, self._text_rect)
+        self._store_render(key)
 
         # reposition the rect as initially
         self.rect.topleft = pos
+
+    def _get_text(self) -> str:
+        return self._text
+
+    def _set_text(self, text: str):
+        if text != self._text:
+            self._text = text
+            self.redraw()
+            self.invalidate_layout()
+
+    text = property(_get_text, _set_text, doc="The text displayed")
+
+    def _surfaces(self) -> list:
+        return super()._surfaces() + [self._text_img]
+
+    def _get_opaque(self) -> bool:
+        return Color(self._bg_color).a == 255
+
+    opaque = property(_get_opaque, doc="Is the background color of the Label opaque ?")
+
+    def release(self):
+        self._text_img = None
+        super().release()
@@ -0,0 +1,317 @@
+# -*- coding: utf-8 -*-
+"""Provide a loader building trees of widgets from JSON (or YAML) descriptions, compiled once into build plans."""
+
+import json
+import os
+
+from wipyg.abstracts import *
+from pygame import constants
+from pygame.image import load
+from wipyg.buttons import PlainButton, SubmitButton, CancelButton, IconButton
+from wipyg.containers import Frame, Window
+from wipyg.entry import Entry
+from wipyg.label import Label
+from wipyg.resources import get_font, get_scale, scaled
+
+try:
+    import yaml
+except ImportError:  # only the JSON descriptions can be loaded without PyYAML
+    yaml = None
+
+# the arguments each type of widget accepts in a description
+_LEAVES = {
+    "Label": (Label, {"text", "font", "size", "color", "bg_color"}),
+    "PlainButton": (PlainButton, {"text", "font", "size", "state"}),
+    "SubmitButton": (SubmitButton, {"text", "font", "size", "state"}),
+    "CancelButton": (CancelButton, {"text", "font", "size", "state"}),
+    "Entry": (Entry, {"value", "font", "size", "length", "state"}),
+    "IconButton": (IconButton, {"icon", "active_icon", "disabled_icon", "state"}),
+}
+_CONTAINERS = {
+    "Frame": {"grid", "bg_color", "direct", "column_weights", "line_weights"},
+    "Window": {"content", "bar_color", "direct"},
+}
+# the keys every node may have
+_COMMON = {"type", "id", "on", "pos"}
+# the keys of the children of the containers
+_CHILDREN = {"grid", "content"}
+# the custom events, with the attribute of the event giving the widget it comes
+# from and the class of the widgets emitting it
+_EVENTS = {
+    "clicked": (Button.CLICKED, "button", Button),
+    "submit": (Entry.SUBMIT, "entry", Entry),
+}
+_FILES = {"font", "icon", "active_icon", "disabled_icon"}
+
+# path -> (modification time, size, plan)
+_plans = {}
+
+
+def _event_type(name: str, cls: type) -> Tuple[int, str]:
+    """Return the event type of a name of the description, and the attribute giving its source"""
+    if name in _EVENTS:
+        event_type, attribute, emitter = _EVENTS[name]
+        if not issubclass(cls, emitter):
+            raise ValueError(f"A {cls.__name__} never emits {name!r} events")
+        return event_type, attribute
+    event_type = getattr(constants, name.upper(), None)
+    if not isinstance(event_type, int):
+        raise ValueError(f"Unknown event {name!r}")
+    return event_type, None
+
+
+def _from_source(handler, attribute: str):
+    """Wrap handler to only call it for the events coming from the widget it reacts on"""
+
+    def reaction(w, e):
+        if getattr(e, attribute, None) is w:
+            return handler(w, e)
+
+    return reaction
+
+
+class LayoutPlan:
+    """A description of a tree of widgets compiled into the steps building it
+
+    The description is parsed and checked once, `build` then only calls the
+    constructors of the widgets, in an order such that each Frame is given its
+    whole grid at once and is measured and laid out in a single pass. The fonts
+    and icons are loaded once for all the widgets and all the builds.
+
+    A description is a node, a dict with a "type" (Frame, Window, Label,
+    PlainButton, SubmitButton, CancelButton, Entry or IconButton) and the
+    arguments of its constructor (a Frame has a "grid" of nodes or null, a
+    Window a "content" node), colors being lists of numbers and fonts and icons
+    file names (relative to the description file). Any node can also have:
+
+    - "id": a name to find the widget in the dictionary returned by `build`
+    - "on": a dict of event names ("clicked" for a button, "submit" for an
+      Entry or a pygame event type like "mousebuttonup") to names of handlers
+      given to `build`
+    - "pos": the [x, y] position of the root node, useful for a Window, the
+      other widgets are placed by their container
+
+    Methods
+    -------
+    build(handlers : dict) -> (Widget, dict)
+        Build a new tree of widgets from the plan
+    """
+
+    def __init__(self, description: dict, directory: str = None) -> None:
+        """Compile a description
+
+        Parameters
+        ----------
+        description : dict
+            The root node, as parsed from JSON
+        directory : str, optional
+            The directory of the font and icon file names, by default the current directory
+
+        Raises
+        ------
+        ValueError
+            The description is invalid
+        """
+        self._directory = directory
+        self._steps = []
+        self._fonts = set()
+        self._icons = {}
+        self._compile(description, root=True)
+
+    def _path(self, name: str) -> str:
+        if self._directory is None:
+            return name
+        return os.path.join(self._directory, name)
+
+    def _arguments(self, node: dict, accepted: set) -> dict:
+        """Return the arguments of the constructor of a node"""
+        unknown = set(node) - accepted - _COMMON
+        if unknown:
+            raise ValueError(f"Unknown keys for a {node['type']} : {sorted(unknown)}")
+        kwargs = {}
+        for key, value in node.items():
+            if key in _COMMON or key in _CHILDREN:
+                continue
+            if isinstance(value, list):
+                value = tuple(value)
+            if key in _FILES and value is not None:
+                value = self._path(value)
+                if key != "font":
+                    # the icons are loaded by the first build
+                    self._icons[value] = None
+            kwargs[key] = value
+        if "font" in accepted or "size" in accepted:
+            self._fonts.add((kwargs.get("font"), kwargs.get("size", 30)))
+        return kwargs
+
+    def _compile(self, node: dict, root: bool = False):
+        """Add the steps building node, its children being built first"""
+        if not isinstance(node, dict) or "type" not in node:
+            raise ValueError(f"A node must be a dict with a type, not {node!r}")
+        kind = node["type"]
+        if kind in _LEAVES:
+            cls, accepted = _LEAVES[kind]
+            kwargs = self._arguments(node, accepted)
+            self._steps.append((kind, cls, kwargs, None, self._extras(node, cls, root)))
+        elif kind == "Frame":
+            kwargs = self._arguments(node, _CONTAINERS[kind])
+            grid = node.get("grid")
+            if not grid or not all(isinstance(line, list) for line in grid):
+                raise ValueError("A Frame must have a grid, a non empty list of lists")
+            columns = max(len(line) for line in grid)
+            if not columns:
+                raise ValueError(
+                    "There must be at least one cell in the grid of a Frame"
+                )
+            # the shape of the grid, True where a widget is built
+            shape = []
+            for line in grid:
+                cells = list(line) + [None] * (columns - len(line))
+                shape.append(tuple(cell is not None for cell in cells))
+                for cell in cells:
+                    if cell is not None:
+                        self._compile(cell)
+            extras = self._extras(node, Frame, root)
+            self._steps.append((kind, Frame, kwargs, tuple(shape), extras))
+        elif kind == "Window":
+            kwargs = self._arguments(node, _CONTAINERS[kind])
+            if "content" not in node:
+                raise ValueError("A Window must have a content")
+            self._compile(node["content"])
+            self._steps.append(
+                (kind, Window, kwargs, None, self._extras(node, Window, root))
+            )
+        else:
+            raise ValueError(f"Unknown type of widget {kind!r}")
+
+    def _extras(self, node: dict, cls: type, root: bool) -> tuple:
+        """Return the id, reactions and position of a node, only the root can have a position"""
+        reactions = []
+        for name, handler in (node.get("on") or {}).items():
+            event_type, attribute = _event_type(name, cls)
+            reactions.append((event_type, attribute, handler))
+        pos = node.get("pos")
+        if pos is not None and not root:
+            raise ValueError(
+                f"Only the root node can have a pos, not a {node['type']} placed by its container"
+            )
+        return node.get("id"), tuple(reactions), None if pos is None else tuple(pos)
+
+    def _load_resources(self):
+        """Load the fonts and icons of all the widgets at once"""
+        scale = get_scale()
+        for font, size in self._fonts:
+            get_font(font, scaled(size, scale))
+        for path, icon in self._icons.items():
+            if icon is None:
+                self._icons[path] = load(path)
+
+    def build(self, handlers: dict = None) -> Tuple[Widget, dict]:
+        """Build a new tree of widgets from the plan
+
+        Parameters
+        ----------
+        handlers : dict[str, (Widget, Event) -> bool], optional
+            The callbacks named in the "on" of the nodes, see `Widget.add_reaction`
+
+        Returns
+        -------
+        (Widget, dict[str, Widget])
+            The root of the tree and the widgets having an id
+
+        Raises
+        ------
+        KeyError
+            A handler named in the description is missing
+        """
+        handlers = handlers or {}
+        self._load_resources()
+        ids = {}
+        built = []
+        for kind, cls, kwargs, shape, (name, reactions, pos) in self._steps:
+            if kind == "Frame":
+                count = sum(sum(line) for line in shape)
+                children = iter(built[len(built) - count :])
+                del built[len(built) - count :]
+                grid = [
+                    [next(children) if cell else None for cell in line]
+                    for line in shape
+                ]
+                w = cls(grid, **kwargs)
+            elif kind == "Window":
+                w = cls(built.pop(), **kwargs)
+            elif kind == "IconButton":
+                icons = {
+                    key: (
+                        self._icons[value]
+                        if key in _FILES and value is not None
+                        else value
+                    )
+                    for key, value in kwargs.items()
+                }
+                w = cls(**icons)
+            else:
+                w = cls(**kwargs)
+            for event_type, attribute, handler in reactions:
+                if handler not in handlers:
+                    raise KeyError(f"No handler named {handler!r}")
+                callback = handlers[handler]
+                if attribute is not None:
+                    callback = _from_source(callback, attribute)
+                w.add_reaction(event_type, callback)
+            if pos is not None:
+                w.rect.topleft = pos
+            if name is not None:
+                ids[name] = w
+            built.append(w)
+        return built[0], ids
+
+
+def compile_layout(description: dict, directory: str = None) -> LayoutPlan:
+    """Compile a description into a LayoutPlan, see `LayoutPlan` for its format
+
+    Parameters
+    ----------
+    description : dict
+    directory : str, optional
+        The directory of the font and icon file names, by default the current directory
+
+    Returns
+    -------
+    LayoutPlan
+    """
+    return LayoutPlan(description, directory)
+
+
+def load_layout(path) -> LayoutPlan:
+    """Return the LayoutPlan of a description file, compiled once until the file changes
+
+    Parameters
+    ----------
+    path : filename
+        A .json file, or a .yaml or .yml file if PyYAML is installed
+
+    Returns
+    -------
+    LayoutPlan
+
+    Raises
+    ------
+    ImportError
+        A YAML file needs PyYAML
+    """
+    path = os.path.abspath(path)
+    stat = os.stat(path)
+    cached = _plans.get(path)
+    if cached is not None and cached[:2] == (stat.st_mtime_ns, stat.st_size):
+        return cached[2]
+    with open(path, encoding="utf-8") as f:
+        if path.endswith((".yaml", ".yml")):
+            if yaml is None:
+                raise ImportError("PyYAML is needed to load a YAML description")
+            description = yaml.safe_load(f)
+        else:
+            description = json.load(f)
+    plan = LayoutPlan(description, os.path.dirname(path))
+    _plans[path] = (stat.st_mtime_ns, stat.st_size, plan)
+    return plan
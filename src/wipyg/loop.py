@@ -0,0 +1,162 @@
+# -*- coding: utf-8 -*-
+"""Provide a main loop that sleeps while the widgets have nothing to do."""
+
+from time import perf_counter
+
+import pygame
+from pygame.time import get_ticks, Clock
+from wipyg.abstracts import *
+
+
+class MainLoop:
+    """A main loop that only draws the screen when a widget changed
+
+    Between frames it blocks on `pygame.event.wait`, waking up for the next event
+    or for the nearest widget timer (like the blinking cursor of an `Entry`), so
+    the CPU stays idle while the screen is static.
+
+    Methods
+    -------
+    run()
+        Run the loop until `stop()` is called or a QUIT event arrives
+    stop()
+        Make `run` return after the current iteration
+
+    Attributes
+    ----------
+    widgets : Group
+        The top-level widgets, updated and drawn in this order
+    idle_time : float
+        Seconds spent waiting for events
+    active_time : float
+        Seconds spent handling events and drawing
+    frames : int
+        Number of frames drawn
+    idle_ratio : float
+        Part of the time spent waiting, read only
+    """
+
+    # events after which the whole screen must be drawn again
+    EXPOSURE = (VIDEOEXPOSE, VIDEORESIZE, WINDOWEXPOSED, WINDOWRESTORED)
+
+    def __init__(
+        self,
+        widgets,
+        screen: Surface = None,
+        bg_color=(0, 0, 0),
+        on_event=None,
+        fps: int = 60,
+    ) -> None:
+        """
+        Parameters
+        ----------
+        widgets : Group | list[Widget]
+            The top-level widgets
+        screen : Surface, optional
+            Where to draw the widgets, by default the display surface
+        bg_color : color, optional
+            Color filling the screen before the widgets are drawn, by default black
+        on_event : (Event) -> None, optional
+            Called for each event after the widgets reacted to it, by default None
+        fps : int, optional
+            Maximum number of frames per second, 0 for no limit, by default 60
+        """
+        if not isinstance(widgets, AbstractGroup):
+            widgets = Group(widgets)
+        self.widgets = widgets
+        self._screen = screen
+        self._bg_color = bg_color
+        self._on_event = on_event
+        self._fps = fps
+        self._clock = Clock()
+        self._running = False
+        self._exposed = True
+        self._count = 0
+        self.idle_time = 0.0
+        self.active_time = 0.0
+        self.frames = 0
+
+    def _next_timer(self) -> int:
+        """Return the nearest timer of the widgets, None if they are all static"""
+        timers = [w.next_timer() for w in self.widgets]
+        timers = [t for t in timers if t is not None]
+        return min(timers) if timers else None
+
+    def _dispatch(self, event: Event):
+        # a tree capturing the pointer is the only one to see the pointer events
+        capturing = None
+        if event.type in FocusManager.POINTER:
+            for w in self.widgets:
+                manager = getattr(w, "_focus_manager", None)
+                if manager is not None and manager.captured is not None:
+                    capturing = w
+        if capturing is not None:
+            capturing.react(event)
+        else:
+            for w in self.widgets:
+                w.react(event)
+        if self._on_event is not None:
+            self._on_event(event)
+        if event.type == QUIT:
+            self.stop()
+        elif event.type in MainLoop.EXPOSURE:
+            self._exposed = True
+
+    def _needs_frame(self, timer: int) -> bool:
+        if self._exposed or len(self.widgets) != self._count:
+            return True
+        if timer is not None and timer <= get_ticks():
+            return True
+        return any(w.dirty for w in self.widgets)
+
+    def _draw(self):
+        screen = self._screen or pygame.display.get_surface()
+        self.widgets.update()
+        screen.fill(self._bg_color)
+        for w in self.widgets:
+            w.draw(screen)
+        pygame.display.flip()
+        self._exposed = False
+        self._count = len(self.widgets)
+        self.frames += 1
+
+    def run(self):
+        """Run the loop until `stop()` is called or a QUIT event arrives"""
+        self._running = True
+        while self._running:
+            start = perf_counter()
+            timer = self._next_timer()
+            delay = None if timer is None else timer - get_ticks()
+            if delay is None:
+                events = [pygame.event.wait()]
+            elif delay > 0:
+                events = [pygame.event.wait(delay)]
+            else:
+                events = []
+            awake = perf_counter()
+            self.idle_time += awake - start
+
+            events.extend(pygame.event.get())
+            for e in events:
+                if e.type != NOEVENT:
+                    self._dispatch(e)
+
+            if self._running and self._needs_frame(timer):
+                self._draw()
+            self.active_time += perf_counter() - awake
+
+            if self._fps:
+                # Clock.tick sleeps to respect the frame rate
+                start = perf_counter()
+                self._clock.tick(self._fps)
+                self.idle_time += perf_counter() - start
+
+    def stop(self):
+        """Make `run` return after the current iteration"""
+        self._running = False
+
+    def _get_idle_ratio(self) -> float:
+        total = self.idle_time + self.active_time
+        return self.idle_time / total if total else 0.0
+
+    idle_ratio = property(_get_idle_ratio, doc="Part of the time spent waiting")
@@ -0,0 +1,108 @@
+# -*- coding: utf-8 -*-
+"""Account for the memory used by the surfaces of the widgets and release the hidden ones."""
+
+from wipyg.abstracts import *
+
+
+def _hidden(w: Widget) -> bool:
+    """Can't the widget be seen ? (off-screen or clipped out by its containers, like in a minimized Window)"""
+    visible = w.visible_rect
+    return not (visible.width and visible.height)
+
+
+def memory_report(root: Widget) -> list:
+    """List the memory used by each widget of a tree
+
+    Parameters
+    ----------
+    root : Widget
+
+    Returns
+    -------
+    list[(Widget, int, int)]
+        For each widget of the tree (parents first), the bytes used by its own
+        surfaces and by the surfaces of its whole subtree
+    """
+    report = []
+    todo = [root]
+    while todo:
+        w = todo.pop()
+        report.append((w, w.surface_bytes(), w.subtree_bytes()))
+        if isinstance(w, Container):
+            todo.extend(reversed([c for c in w._widgets if isinstance(c, Widget)]))
+    return report
+
+
+class MemoryBudget:
+    """A policy releasing the surfaces of hidden subtrees when a budget is exceeded
+
+    The widgets that can't be seen, outside of the screen or of the visible
+    area of their containers (like the content of a minimized `Window`), are
+    released, the biggest subtrees first, until the surfaces of the trees fit
+    in the budget. They are redrawn when they are shown again. Disabled
+    widgets are still drawn, so they are kept. The roots themselves are never
+    released.
+
+    Methods
+    -------
+    enforce(*roots : Widget) -> int
+        Release hidden subtrees until the roots fit in the budget
+
+    Attributes
+    ----------
+    budget : int
+        Maximum number of bytes the surfaces of the trees should use
+    """
+
+    def __init__(self, budget: int) -> None:
+        """
+        Parameters
+        ----------
+        budget : int
+            Maximum number of bytes the surfaces of the trees should use
+        """
+        self.budget = budget
+
+    def _candidates(self, root: Widget) -> list:
+        """Return the biggest hidden subtrees of root that can be released"""
+        candidates = []
+        todo = [w for w in getattr(root, "_widgets", []) if isinstance(w, Widget)]
+        while todo:
+            w = todo.pop()
+            if w._released:
+                continue
+            if _hidden(w):
+                candidates.append(w)
+            elif isinstance(w, Container):
+                todo.extend(c for c in w._widgets if isinstance(c, Widget))
+        return candidates
+
+    def enforce(self, *roots: Widget) -> int:
+        """Release hidden subtrees until the surfaces of the roots fit in the budget
+
+        Call it from time to time, for example after each frame or when a Window
+        is minimized.
+
+        Parameters
+        ----------
+        roots : Widget
+            The top-level widgets
+
+        Returns
+        -------
+        int
+            The number of bytes released
+        """
+        total = sum(r.subtree_bytes() for r in roots)
+        if total <= self.budget:
+            return 0
+
+        sized = [(w.subtree_bytes(), w) for r in roots for w in self._candidates(r)]
+        sized.sort(key=lambda c: c[0], reverse=True)
+        released = 0
+        for size, w in sized:
+            if total - released <= self.budget:
+                break
+            w.release()
+            released += size - w.subtree_bytes()
+        return released
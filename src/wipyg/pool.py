@@ -0,0 +1,175 @@
+# -*- coding: utf-8 -*-
+"""Provide a pool recycling the widgets of the dialogs opened and closed often."""
+
+from wipyg.abstracts import *
+
+
+class WidgetPool:
+    """Keep the killed widgets of a kind to reuse them rather than building new ones
+
+    A kind is registered with a factory building the widget (a whole dialog
+    Window for example) and a setup function giving new values to a recycled
+    one. `acquire` returns a recycled widget if there is one, so its fonts,
+    surfaces and reactions are reused, and builds a new one otherwise. The
+    widgets given by `acquire` come back to the pool when they are killed (like
+    a Window closed by its cross) or given back with `recycle`, they are then
+    removed from their container and `Widget.reset`.
+
+    Methods
+    -------
+    register(kind, factory : (...) -> Widget, setup : (Widget, ...) -> None)
+        Tell the pool how to build and set up the widgets of a kind
+    acquire(kind, *args, **kwargs) -> Widget
+        A recycled or new widget of this kind, set up with the arguments
+    recycle(w : Widget)
+        Give back a widget given by `acquire`
+    available(kind) -> int
+        How many recycled widgets of this kind are waiting in the pool
+    clear()
+        Forget the recycled widgets
+
+    Attributes
+    ----------
+    hits : int
+        Number of widgets given by `acquire` that were recycled
+    misses : int
+        Number of widgets given by `acquire` that were built
+    hit_rate : float
+        The proportion of recycled widgets given by `acquire`, read only
+    """
+
+    def __init__(self, max_size: int = 8) -> None:
+        """Create an empty pool
+
+        Parameters
+        ----------
+        max_size : int, optional
+            Maximum number of recycled widgets kept for each kind, the others
+            are forgotten, by default 8
+        """
+        self._max_size = max_size
+        self._kinds = {}
+        self._free = {}
+        # the kind of each widget given by acquire and not back yet
+        self._lent = {}
+        # kill() removes a widget from this group, like for the WindowManager
+        self._alive = Group()
+        self.hits = 0
+        self.misses = 0
+
+    def register(self, kind, factory, setup=None):
+        """Tell the pool how to build and set up the widgets of a kind
+
+        Parameters
+        ----------
+        kind : hashable
+            The name of the kind, like "confirm_dialog"
+        factory : (*args, **kwargs) -> Widget
+            Build a new widget from the arguments of `acquire`
+        setup : (Widget, *args, **kwargs) -> None, optional
+            Give the arguments of `acquire` to a recycled widget, like new texts,
+            by default None to reuse the widgets as they are
+
+        Raises
+        ------
+        ValueError
+            The kind is already registered
+        """
+        if kind in self._kinds:
+            raise ValueError(f"The kind {kind!r} is already registered")
+        self._kinds[kind] = (factory, setup)
+        self._free[kind] = []
+
+    def acquire(self, kind, *args, **kwargs) -> Widget:
+        """Return a recycled or new widget of this kind, set up with the arguments
+
+        Parameters
+        ----------
+        kind : hashable
+            A kind given to `register`
+        *args, **kwargs
+            The arguments of its factory and setup functions
+
+        Returns
+        -------
+        Widget
+            Not in any container, it comes back to the pool when it is killed
+        """
+        self._collect()
+        factory, setup = self._kinds[kind]
+        free = self._free[kind]
+        if free:
+            w = free.pop()
+            self.hits += 1
+            if setup is not None:
+                setup(w, *args, **kwargs)
+        else:
+            w = factory(*args, **kwargs)
+            self.misses += 1
+        self._lent[w] = kind
+        self._alive.add(w)
+        return w
+
+    def recycle(self, w: Widget):
+        """Give back a widget given by `acquire`, without killing it
+
+        It is removed from its container.
+
+        Parameters
+        ----------
+        w : Widget
+
+        Raises
+        ------
+        ValueError
+            w wasn't given by `acquire` or is already back
+        """
+        if w not in self._lent:
+            raise ValueError("The widget wasn't given by this pool")
+        self._alive.remove(w)
+        self._store(self._lent.pop(w), w)
+
+    def _collect(self):
+        """Take back the widgets killed since the last call"""
+        if len(self._lent) != len(self._alive):
+            for w in [w for w in self._lent if not self._alive.has(w)]:
+                self._store(self._lent.pop(w), w)
+
+    def _store(self, kind, w: Widget):
+        container = w.container
+        if container is not None:
+            # a WindowManager only forgets its killed Windows lazily
+            if w in container._widgets:
+                container.del_widget(w)
+            w.container = None
+        w.reset()
+        free = self._free[kind]
+        if len(free) < self._max_size:
+            free.append(w)
+
+    def available(self, kind) -> int:
+        """Return how many recycled widgets of this kind are waiting in the pool
+
+        Parameters
+        ----------
+        kind : hashable
+
+        Returns
+        -------
+        int
+        """
+        self._collect()
+        return len(self._free[kind])
+
+    def clear(self):
+        """Forget the recycled widgets, the kinds stay registered"""
+        for free in self._free.values():
+            free.clear()
+
+    def _get_hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    hit_rate = property(
+        _get_hit_rate, doc="The proportion of recycled widgets given by acquire"
+    )
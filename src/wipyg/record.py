@@ -0,0 +1,215 @@
+# -*- coding: utf-8 -*-
+"""Record the events received by a widget and replay them to measure its performances."""
+
+import gzip
+import json
+from time import perf_counter, sleep
+
+import pygame
+from wipyg.abstracts import *
+from wipyg.entry import Entry
+
+# custom event types are numbered in the order they are created, so they are
+# saved by name to survive a different import order when replaying
+CUSTOM_EVENTS = {
+    "Button.CLICKED": Button.CLICKED,
+    "Entry.SUBMIT": Entry.SUBMIT,
+}
+
+
+def _widget_path(root: Widget, w: Widget):
+    """Return the indices leading from root to w through the containers, or None"""
+    path = []
+    while w is not root:
+        if w.container is None:
+            return None
+        path.append(w.container._widgets.index(w))
+        w = w.container
+    path.reverse()
+    return path
+
+
+def _encode(root: Widget, value):
+    if isinstance(value, Widget):
+        return {"widget": _widget_path(root, value)}
+    elif isinstance(value, (tuple, list)):
+        return [_encode(root, v) for v in value]
+    elif value is None or isinstance(value, (bool, int, float, str)):
+        return value
+    else:
+        # not something we can replay
+        return None
+
+
+def _decode(root: Widget, value):
+    if isinstance(value, dict):
+        w = root
+        if value["widget"] is None:
+            return None
+        for i in value["widget"]:
+            w = w._widgets[i]
+        return w
+    elif isinstance(value, list):
+        return tuple(_decode(root, v) for v in value)
+    else:
+        return value
+
+
+def _percentiles(samples: list) -> dict:
+    """Return the 50th, 90th and 99th percentiles and the max of samples (in ms)"""
+    if not samples:
+        return {"p50": 0.0, "p90": 0.0, "p99": 0.0, "max": 0.0}
+    ordered = sorted(samples)
+    last = len(ordered) - 1
+    return {
+        "p50": ordered[round(0.50 * last)] * 1000,
+        "p90": ordered[round(0.90 * last)] * 1000,
+        "p99": ordered[round(0.99 * last)] * 1000,
+        "max": ordered[last] * 1000,
+    }
+
+
+class Recorder:
+    """Record the events received by a top-level Widget, frame by frame
+
+    Use the Recorder in place of the widget in the main loop: `react` and
+    `update` are forwarded to the widget, each call to `update` ending a frame.
+    Widgets in the payload of custom events (`Button.CLICKED`, `Entry.SUBMIT`...)
+    are saved as their position in the tree of the recorded widget.
+
+    Methods
+    -------
+    react(e : Event)
+        Record the event and send it to the widget
+    update()
+        Update the widget and end the current frame
+    save(path : str)
+        Write the recording in a (gzipped JSON) file
+    """
+
+    def __init__(self, widget: Widget) -> None:
+        """
+        Parameters
+        ----------
+        widget : Widget
+            The top-level widget whose events are recorded
+        """
+        self._widget = widget
+        self._start = perf_counter()
+        self._events = []
+        self._frames = []
+
+    def react(self, event: Event):
+        """Record the event and send it to the widget
+
+        Parameters
+        ----------
+        event : Event
+        """
+        type = event.type
+        for name, custom in CUSTOM_EVENTS.items():
+            if custom == type:
+                type = name
+        attributes = {k: _encode(self._widget, v) for k, v in event.dict.items()}
+        self._events.append([perf_counter() - self._start, type, attributes])
+        return self._widget.react(event)
+
+    def update(self, *args, **kwargs):
+        """Update the widget and end the current frame"""
+        self._widget.update(*args, **kwargs)
+        self._frames.append([perf_counter() - self._start, self._events])
+        self._events = []
+
+    def save(self, path: str):
+        """Write the recording in a file
+
+        Parameters
+        ----------
+        path : str
+            Name of the file, the events of the current frame aren't saved if it isn't ended
+        """
+        recording = {
+            "version": 1,
+            "pygame": pygame.version.ver,
+            "frames": self._frames,
+        }
+        with gzip.open(path, "wt", encoding="utf-8") as f:
+            json.dump(recording, f, separators=(",", ":"))
+
+
+class Replayer:
+    """Replay a recording to a Widget built like the recorded one and measure it
+
+    pygame must be initialized (with the "dummy" SDL video driver to run headless)
+    since the widgets may post events. The events posted by the widgets while
+    replaying are dropped, the recording already contains them.
+
+    Methods
+    -------
+    run(surface : Surface, realtime : bool) -> dict
+        Replay all the frames and return the latency percentiles
+    """
+
+    def __init__(self, widget: Widget, path: str) -> None:
+        """
+        Parameters
+        ----------
+        widget : Widget
+            The top-level widget receiving the events, with the same tree as the recorded one
+        path : str
+            Name of a file written by `Recorder.save`
+        """
+        self._widget = widget
+        with gzip.open(path, "rt", encoding="utf-8") as f:
+            self._frames = json.load(f)["frames"]
+
+    def _event(self, type, attributes) -> Event:
+        if isinstance(type, str):
+            type = CUSTOM_EVENTS[type]
+        return Event(type, {k: _decode(self._widget, v) for k, v in attributes.items()})
+
+    def run(self, surface: Surface = None, realtime: bool = False) -> dict:
+        """Replay all the frames
+
+        Parameters
+        ----------
+        surface : Surface, optional
+            Where to draw the widget after each frame, by default the widget isn't drawn
+        realtime : bool, optional
+            Respect the timing of the recording rather than going as fast as possible, by default False
+
+        Returns
+        -------
+        dict
+            For each of "react", "update" and "draw", a dict of the "p50", "p90",
+            "p99" and "max" latencies per frame in milliseconds, and "frames" the number of frames
+        """
+        timings = {"react": [], "update": [], "draw": []}
+        start = perf_counter()
+        for end, events in self._frames:
+            react_time = 0.0
+            for t, type, attributes in events:
+                if realtime:
+                    sleep(max(0.0, t - (perf_counter() - start)))
+                event = self._event(type, attributes)
+                before = perf_counter()
+                self._widget.react(event)
+                react_time += perf_counter() - before
+            pygame.event.clear()
+            timings["react"].append(react_time)
+
+            before = perf_counter()
+            self._widget.update()
+            timings["update"].append(perf_counter() - before)
+
+            if surface is not None:
+                before = perf_counter()
+                self._widget.draw(surface)
+                timings["draw"].append(perf_counter() - before)
+
+            if realtime:
+                sleep(max(0.0, end - (perf_counter() - start)))
+
+        report = {name: _percentiles(samples) for name, samples in timings.items()}
+        report["frames"] = len(self._frames)
+        return report
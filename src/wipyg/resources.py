@@ -0,0 +1,133 @@
+# -*- coding: utf-8 -*-
+"""Provide the global scale factor of the widgets, caches of the fonts and icons at each scale and the installed render cache."""
+
+import weakref
+
+from pygame.font import Font
+from pygame.surface import Surface
+from pygame.transform import scale as _scale_surface, smoothscale
+
+_scale = 1.0
+_fonts = {}
+# for each icon, its copies by scale factor
+_icons = weakref.WeakKeyDictionary()
+# the RenderCache of wipyg.diskcache used by the widgets, if one is installed
+_render_cache = None
+
+
+def get_scale() -> float:
+    """Return the scale factor of the widgets that aren't given one
+
+    Returns
+    -------
+    float
+    """
+    return _scale
+
+
+def set_scale(scale: float):
+    """Change the scale factor of the widgets that aren't given one
+
+    Set it before building the widgets, the widgets already built must be
+    told with `Widget.rescale`. See `Widget.scale` to scale a tree of widgets only.
+
+    Parameters
+    ----------
+    scale : float
+        For example 2.0 on a 4K screen for a UI designed for full HD
+    """
+    global _scale
+    if scale <= 0:
+        raise ValueError("The scale factor must be positive")
+    _scale = scale
+
+
+def scaled(value: int, scale: float) -> int:
+    """Return a length in pixels multiplied by scale, at least 1 if it wasn't 0
+
+    Parameters
+    ----------
+    value : int
+    scale : float
+
+    Returns
+    -------
+    int
+    """
+    if not value:
+        return 0
+    return max(1, round(value * scale))
+
+
+def get_font(font=None, size: int = 30) -> Font:
+    """Return the Font for these parameters, loaded once and shared by all the widgets
+
+    Parameters
+    ----------
+    font : file | filename, optional
+        The source file for the font, by default None, that is the default Pygame sys font
+    size : int, optional
+        Font size (in pixels, already scaled), by default 30
+
+    Returns
+    -------
+    Font
+    """
+    key = (font, size)
+    loaded = _fonts.get(key)
+    if loaded is None:
+        loaded = _fonts[key] = Font(font, size)
+    return loaded
+
+
+def scaled_icon(icon: Surface, scale: float) -> Surface:
+    """Return icon scaled by scale, computed once for each icon and scale
+
+    The icons must not be modified once they have been scaled.
+
+    Parameters
+    ----------
+    icon : Surface
+    scale : float
+
+    Returns
+    -------
+    Surface
+        icon itself if scale is 1
+    """
+    if scale == 1:
+        return icon
+    copies = _icons.get(icon)
+    if copies is None:
+        copies = _icons[icon] = {}
+    copy = copies.get(scale)
+    if copy is None:
+        size = (scaled(icon.get_width(), scale), scaled(icon.get_height(), scale))
+        if icon.get_bitsize() in (24, 32):
+            copy = smoothscale(icon, size)
+        else:
+            copy = _scale_surface(icon, size)
+        copies[scale] = copy
+    return copy
+
+
+def get_render_cache():
+    """Return the installed `wipyg.diskcache.RenderCache`, None if there isn't one
+
+    Returns
+    -------
+    RenderCache
+    """
+    return _render_cache
+
+
+def set_render_cache(cache):
+    """Install the `wipyg.diskcache.RenderCache` used by the widgets, see `RenderCache.install`
+
+    Parameters
+    ----------
+    cache : RenderCache
+        None to stop using one
+    """
+    global _render_cache
+    _render_cache = cache
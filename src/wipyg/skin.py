@@ -0,0 +1,169 @@
+# -*- coding: utf-8 -*-
+"""Provide nine-slice skins to draw the backgrounds of the widgets from images."""
+
+from wipyg.abstracts import *
+from pygame.image import load
+from pygame.mask import from_surface
+from pygame.transform import scale as _stretch_surface
+from wipyg.resources import scaled, scaled_icon
+
+
+def _cuts(length: int, before: int, after: int) -> Tuple[int, int, int, int]:
+    """Return the 4 positions cutting length in a border before, a middle and a border after
+
+    The borders are shrunk proportionally if they don't fit.
+    """
+    if before + after > length:
+        before = length * before // (before + after)
+        after = length - before
+    return 0, before, length - after, length
+
+
+class Skin:
+    """A nine-slice image to draw the background of a widget of any size
+
+    The image is cut in 9 slices by the margins: the corners are drawn as they
+    are, the edges are stretched along their length and the center in both
+    directions, so the borders keep their thickness whatever the size. The
+    background composed for each size is cached and shared by all the widgets
+    using the Skin, widgets of the same size only cost a blit of it.
+
+    `PlainButton`, `Entry` and `Window` (for its bar) accept a Skin, or a list
+    of three Skins indexed by their states, instead of their drawn colors.
+
+    Methods
+    -------
+    background(size : (int, int), scale : float) -> Surface
+        The image stretched to size, cached
+
+    Attributes
+    ----------
+    margins : (int, int, int, int)
+        The left, top, right and bottom margins of the slices, read only
+    opaque : bool
+        Are all the pixels of the image opaque ? read only
+    """
+
+    # maximum number of backgrounds kept for each Skin and scale factor
+    CACHE_SIZE = 64
+
+    def __init__(self, image, margins) -> None:
+        """Create a Skin from an image
+
+        Parameters
+        ----------
+        image : Surface | filename
+            The image, it must not be modified once the Skin is created
+        margins : int | (int, int, int, int)
+            The thickness of the borders, the same on the four sides, or the
+            left, top, right and bottom ones
+
+        Raises
+        ------
+        ValueError
+            The margins must fit in the image
+        """
+        if not isinstance(image, Surface):
+            image = load(image)
+        if isinstance(margins, int):
+            margins = (margins,) * 4
+        left, top, right, bottom = margins
+        width, height = image.get_size()
+        if min(margins) < 0 or left + right > width or top + bottom > height:
+            raise ValueError("The margins must fit in the image")
+        self._image = image
+        self._margins = tuple(margins)
+        self._backgrounds = {}
+        self._scaled = {}
+        self._opaque = None
+
+    def _at_scale(self, scale: float) -> "Skin":
+        """Return the Skin with its image and margins multiplied by scale"""
+        if scale == 1:
+            return self
+        skin = self._scaled.get(scale)
+        if skin is None:
+            image = scaled_icon(self._image, scale)
+            width, height = image.get_size()
+            left, top, right, bottom = (scaled(m, scale) for m in self._margins)
+            # the rounding may make the margins larger than the image
+            xs = _cuts(width, left, right)
+            ys = _cuts(height, top, bottom)
+            margins = (xs[1], ys[1], width - xs[2], height - ys[2])
+            skin = self._scaled[scale] = Skin(image, margins)
+        return skin
+
+    def _compose(self, size: Tuple[int, int]) -> Surface:
+        """Draw the nine slices stretched to size"""
+        width, height = self._image.get_size()
+        left, top, right, bottom = self._margins
+        xs = (0, left, width - right, width)
+        ys = (0, top, height - bottom, height)
+        dxs = _cuts(size[0], left, right)
+        dys = _cuts(size[1], top, bottom)
+
+        background = Surface(size, SRCALPHA)
+        blits = []
+        for i in range(3):
+            for j in range(3):
+                source = Rect(xs[j], ys[i], xs[j + 1] - xs[j], ys[i + 1] - ys[i])
+                dest = Rect(dxs[j], dys[i], dxs[j + 1] - dxs[j], dys[i + 1] - dys[i])
+                if not (source.width and source.height and dest.width and dest.height):
+                    continue
+                piece = self._image.subsurface(source)
+                if source.size != dest.size:
+                    piece = _stretch_surface(piece, dest.size)
+                blits.append((piece, dest))
+        background.blits(blits, doreturn=False)
+        return background
+
+    def background(self, size: Tuple[int, int], scale: float = 1.0) -> Surface:
+        """Return the image stretched to size, composed once for each size
+
+        Parameters
+        ----------
+        size : (int, int)
+        scale : float, optional
+            The scale factor of the widget (see `Widget.scale`), multiplying the
+            thickness of the borders, by default 1.0
+
+        Returns
+        -------
+        Surface
+            Shared by all the widgets of this size, it must not be modified
+        """
+        skin = self._at_scale(scale)
+        size = tuple(size)
+        background = skin._backgrounds.get(size)
+        if background is None:
+            if len(skin._backgrounds) >= Skin.CACHE_SIZE:
+                # forget the oldest size
+                del skin._backgrounds[next(iter(skin._backgrounds))]
+            background = skin._backgrounds[size] = skin._compose(size)
+        return background
+
+    def _get_margins(self) -> Tuple[int, int, int, int]:
+        return self._margins
+
+    margins = property(
+        _get_margins, doc="The left, top, right and bottom margins of the slices"
+    )
+
+    def _get_opaque(self) -> bool:
+        if self._opaque is None:
+            width, height = self._image.get_size()
+            # count the pixels whose alpha is 255
+            self._opaque = from_surface(self._image, 254).count() == width * height
+        return self._opaque
+
+    opaque = property(_get_opaque, doc="Are all the pixels of the image opaque ?")
+
+
+def _by_state(skin) -> list:
+    """Return the Skins of the three states of a widget given a Skin, a list of them or None"""
+    if skin is None or isinstance(skin, Skin):
+        return [skin] * 3
+    skins = list(skin)
+    if len(skins) != 3:
+        raise ValueError("Give a Skin or a list of three Skins, one for each state")
+    return skins
@@ -0,0 +1,425 @@
+# -*- coding: utf-8 -*-
+"""Provide the Table widget showing columns of data, stored in NumPy arrays if NumPy is installed."""
+
+from wipyg.abstracts import *
+from pygame import Surface, Color
+from pygame.mouse import get_pos
+from wipyg.resources import get_font
+
+try:
+    import numpy
+except ImportError:  # the Table works on lists without NumPy, sorting is only slower
+    numpy = None
+
+
+def _as_column(values):
+    """Return values as an array, or as a list if NumPy isn't installed"""
+    if numpy is not None:
+        return numpy.asarray(values)
+    return list(values)
+
+
+class Table(Widget):
+    """A table showing columns of data below a header line
+
+    Only the visible lines are rendered, the rows are shown in the order of an
+    index permutation computed by `sort` and `filter`, the columns themselves are
+    never reordered. The rendered cells are cached by their text, a value is
+    rendered once however many cells show it, and `set_column` only paints again
+    the visible cells whose value changed.
+
+    Scroll with the mouse wheel, click on a header to sort the rows by this column
+    (click again to reverse the order).
+
+    Methods
+    -------
+    column(name : str) -> array
+        The values of a column, in the order of the rows
+    set_column(name : str, values : array)
+        Replace all the values of a column
+    sort(name : str, reverse : bool)
+        Show the rows in the order of the values of a column
+    filter(mask : array)
+        Only show the rows where mask is true
+
+    Attributes
+    ----------
+    columns : list[str]
+        The names of the columns, read only
+    rows : int
+        The number of rows shown (after the filter), read only
+    first_row : int
+        Index of the first shown row at the top of the Table
+    """
+
+    # maximum number of rendered texts kept
+    CACHE_SIZE = 4096
+
+    def __init__(
+        self,
+        columns: dict,
+        formatters: dict = None,
+        visible_rows: int = 20,
+        widths: dict = None,
+        font=None,
+        size: int = 20,
+        color=(0, 0, 0),
+        bg_color=(255, 255, 255),
+        header_color=(210, 210, 210),
+    ) -> None:
+        """Create a Table widget
+
+        Parameters
+        ----------
+        columns : dict[str, array]
+            The columns (NumPy arrays or sequences of the same length) by name, in the order they are shown
+        formatters : dict[str, (value) -> str], optional
+            How the values of a column are written, by default `str`
+        visible_rows : int, optional
+            Number of rows shown at once, by default 20
+        widths : dict[str, int], optional
+            The width of some columns in pixels (multiplied by the scale factor), by default
+            large enough for the header and the first visible values, longer texts are clipped
+        font : file | filename, optional
+            Font to use, see `pygame.font`, by default None
+        size : int, optional
+            Font size in pixel (multiplied by the scale factor), by default 20
+        color : color, optional
+            Color of the text, by default black
+        bg_color : color, optional
+            Background color of the cells, by default white
+        header_color : color, optional
+            Background color of the header, by default light grey
+
+        Raises
+        ------
+        ValueError
+            All the columns must have the same length
+        """
+        super().__init__()
+        self._names = list(columns)
+        self._data = {name: _as_column(values) for name, values in columns.items()}
+        lengths = {len(values) for values in self._data.values()}
+        if len(lengths) > 1:
+            raise ValueError("All the columns must have the same length")
+        self._length = lengths.pop() if lengths else 0
+        formatters = formatters or {}
+        self._formatters = {name: formatters.get(name, str) for name in self._names}
+
+        self._font_source = font
+        self._size = size
+        self._color = color
+        self._bg_color = bg_color
+        self._header_color = header_color
+        self._visible = visible_rows
+        self._given_widths = widths or {}
+
+        self._sort = None
+        self._mask = None
+        self._first = 0
+        self._refresh_rows()
+
+        self.rect = Rect(0, 0, 0, 0)
+        self._load_resources()
+        self.add_reaction(MOUSEWHEEL, self._scroll)
+        self.add_reaction(MOUSEBUTTONUP, self._click_header)
+        self.redraw()
+
+    def _load_resources(self):
+        self._font = get_font(self._font_source, self._px(self._size))
+        self._padding = self._px(4)
+        self._row_height = self._font.get_height() + self._padding
+        # the texts rendered with another font are useless
+        self._cache = {}
+        self._headers = {
+            name: self._font.render(name, True, self._color) for name in self._names
+        }
+
+        self._widths = {}
+        for name in self._names:
+            if name in self._given_widths:
+                self._widths[name] = self._px(self._given_widths[name])
+            else:
+                texts = [name] + [
+                    self._format(name, value) for value in self._visible_values(name)
+                ]
+                self._widths[name] = (
+                    max(self._font.size(text)[0] for text in texts) + 2 * self._padding
+                )
+        self._offsets = {}
+        x = 0
+        for name in self._names:
+            self._offsets[name] = x
+            x += self._widths[name]
+
+        self.rect.size = x, self._row_height * (self._visible + 1)
+
+    def _refresh_rows(self):
+        """Compute the permutation of the shown rows from the sort and the filter"""
+        if numpy is not None:
+            if self._sort is None:
+                rows = numpy.arange(self._length)
+            else:
+                name, reverse = self._sort
+                rows = numpy.argsort(self._data[name], kind="stable")
+                if reverse:
+                    rows = rows[::-1]
+            if self._mask is not None:
+                rows = rows[self._mask[rows]]
+        else:
+            if self._sort is None:
+                rows = list(range(self._length))
+            else:
+                name, reverse = self._sort
+                rows = sorted(
+                    range(self._length),
+                    key=self._data[name].__getitem__,
+                    reverse=reverse,
+                )
+            if self._mask is not None:
+                rows = [r for r in rows if self._mask[r]]
+        self._rows = rows
+        self._first = max(0, min(self._first, len(rows) - self._visible))
+
+    def _visible_values(self, name: str, start: int = 0, stop: int = None):
+        """Return the values of a column in the visible lines start to stop"""
+        if stop is None:
+            stop = self._visible
+        rows = self._rows[self._first + start : self._first + stop]
+        column = self._data[name]
+        if numpy is not None:
+            return column[rows]
+        return [column[r] for r in rows]
+
+    def _format(self, name: str, value) -> str:
+        return self._formatters[name](value)
+
+    def _cell(self, text: str) -> Surface:
+        """Return the rendered text, from the cache if it was already rendered"""
+        img = self._cache.get(text)
+        if img is None:
+            if len(self._cache) >= Table.CACHE_SIZE:
+                # forget the oldest text
+                del self._cache[next(iter(self._cache))]
+            img = self._cache[text] = self._font.render(text, True, self._color)
+        return img
+
+    def _cell_rect(self, line: int, name: str) -> Rect:
+        """Return the area of a cell, line being the index of the visible line"""
+        return Rect(
+            self._offsets[name],
+            self._row_height * (line + 1),
+            self._widths[name],
+            self._row_height,
+        )
+
+    def _paint_cell(self, line: int, name: str, value, blits: list = None):
+        """Paint a cell, or add its text to blits if given"""
+        cell = self._cell_rect(line, name)
+        text = self._cell(self._format(name, value))
+        # longer texts are clipped to the width of the column
+        area = Rect(0, 0, cell.width - 2 * self._padding, cell.height)
+        pos = (cell.x + self._padding, cell.y + self._padding // 2)
+        if blits is None:
+            self.image.fill(self._bg_color, cell)
+            self.image.blit(text, pos, area)
+        else:
+            blits.append((text, pos, area))
+
+    def _paint_lines(self, start: int, stop: int):
+        """Paint the visible lines start to stop (excluded) on the image"""
+        top = self._row_height * (start + 1)
+        self.image.fill(
+            self._bg_color,
+            Rect(0, top, self.rect.width, self._row_height * (stop - start)),
+        )
+        blits = []
+        for name in self._names:
+            for i, value in enumerate(self._visible_values(name, start, stop)):
+                self._paint_cell(start + i, name, value, blits)
+        self.image.blits(blits, doreturn=False)
+
+    def redraw(self):
+        self.image = Surface(self.rect.size, SRCALPHA)
+        self.image.fill(
+            self._header_color, Rect(0, 0, self.rect.width, self._row_height)
+        )
+        for name in self._names:
+            header = self._headers[name]
+            area = Rect(0, 0, self._widths[name] - 2 * self._padding, self._row_height)
+            pos = (self._offsets[name] + self._padding, self._padding // 2)
+            self.image.blit(header, pos, area)
+        self._paint_lines(0, self._visible)
+
+    def _changed(self):
+        """To call after painting on the image in place"""
+        self._image_changed()
+        self.invalidate()
+
+    def column(self, name: str):
+        """The values of a column, in the order of the rows
+
+        Parameters
+        ----------
+        name : str
+
+        Returns
+        -------
+        array
+            A NumPy array, or a list if NumPy isn't installed, it must not be modified
+        """
+        return self._data[name]
+
+    def set_column(self, name: str, values):
+        """Replace all the values of a column
+
+        Only the visible cells whose value changed are painted again, unless the
+        rows are sorted by this column.
+
+        Parameters
+        ----------
+        name : str
+        values : array
+            The new values, as many as the rows of the Table
+
+        Raises
+        ------
+        ValueError
+            values doesn't have the same length as the other columns
+        """
+        values = _as_column(values)
+        if len(values) != self._length:
+            raise ValueError("All the columns must have the same length")
+        old = self._visible_values(name)
+        self._data[name] = values
+        if self._released:
+            if self._sort is not None and self._sort[0] == name:
+                self._refresh_rows()
+            return
+
+        if self._sort is not None and self._sort[0] == name:
+            self._refresh_rows()
+            self._paint_lines(0, self._visible)
+        else:
+            new = self._visible_values(name)
+            if numpy is not None:
+                changed = numpy.flatnonzero(old != new)
+            else:
+                changed = [i for i, (a, b) in enumerate(zip(old, new)) if a != b]
+            for i in changed:
+                self._paint_cell(i, name, new[i])
+        self._changed()
+
+    def sort(self, name: str = None, reverse: bool = False):
+        """Show the rows in the order of the values of a column
+
+        Parameters
+        ----------
+        name : str, optional
+            The column, by default None to show the rows in their original order
+        reverse : bool, optional
+            Sort in descending order, by default False
+        """
+        self._sort = None if name is None else (name, reverse)
+        self._refresh_rows()
+        if not self._released:
+            self._paint_lines(0, self._visible)
+            self._changed()
+
+    def filter(self, mask=None):
+        """Only show the rows where mask is true
+
+        Parameters
+        ----------
+        mask : array[bool], optional
+            One boolean per row, like `table.column("x") > 0` with NumPy, by default None to show all the rows
+        """
+        if mask is not None:
+            mask = _as_column(mask)
+            if len(mask) != self._length:
+                raise ValueError("The mask must have one value per row")
+            if numpy is not None:
+                mask = mask.astype(bool)
+        self._mask = mask
+        self._refresh_rows()
+        if not self._released:
+            self._paint_lines(0, self._visible)
+            self._changed()
+
+    def _get_columns(self) -> list:
+        return list(self._names)
+
+    columns = property(_get_columns, doc="The names of the columns")
+
+    def _get_rows(self) -> int:
+        return len(self._rows)
+
+    rows = property(_get_rows, doc="The number of rows shown (after the filter)")
+
+    def _get_first_row(self) -> int:
+        return self._first
+
+    def _set_first_row(self, first: int):
+        first = max(0, min(first, len(self._rows) - self._visible))
+        delta = first - self._first
+        if not delta:
+            return
+        self._first = first
+        if self._released:
+            return
+        if abs(delta) >= self._visible:
+            self._paint_lines(0, self._visible)
+        else:
+            # move the lines still visible and only paint the new ones
+            body = self.image.subsurface(
+                Rect(
+                    0,
+                    self._row_height,
+                    self.rect.width,
+                    self._row_height * self._visible,
+                )
+            )
+            body.scroll(0, -delta * self._row_height)
+            if delta > 0:
+                self._paint_lines(self._visible - delta, self._visible)
+            else:
+                self._paint_lines(0, -delta)
+        self._changed()
+
+    first_row = property(
+        _get_first_row,
+        _set_first_row,
+        doc="Index of the first shown row at the top of the Table",
+    )
+
+    def _scroll(self, _, e):
+        if self._hit(get_pos()):
+            self.first_row -= 3 * e.y
+
+    def _click_header(self, _, e):
+        if e.button != 1 or not self._hit(e.pos):
+            return
+        x, y = e.pos[0] - self.abs_rect.x, e.pos[1] - self.abs_rect.y
+        if y >= self._row_height:
+            return
+        for name in self._names:
+            if self._offsets[name] <= x < self._offsets[name] + self._widths[name]:
+                reverse = self._sort == (name, False)
+                self.sort(name, reverse)
+                return
+
+    def _surfaces(self) -> list:
+        return (
+            super()._surfaces()
+            + list(self._headers.values())
+            + list(self._cache.values())
+        )
+
+    def release(self):
+        self._cache = {}
+        super().release()
+
+    def _get_opaque(self) -> bool:
+        return Color(self._bg_color).a == 255 and Color(self._header_color).a == 255
+
+    opaque = property(_get_opaque, doc="Are the backgrounds of the Table opaque ?")